@@ -0,0 +1,92 @@
+"""
+Import-time benchmark for vcegen.
+
+Runs each scenario in a fresh interpreter with `python -X importtime` and fails
+if a scenario pulls in a heavy module it should not need, or exceeds its time budget.
+
+Usage:
+    python benchmarks/importtime.py [--repeat 5] [--budget-scale 1.0]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["pandas", "pdfplumber", "pdfminer", "pymupdf", "wordninja", "numpy"]
+
+# (name, command, modules that must not be imported, budget in milliseconds)
+SCENARIOS = [
+    ("import vcegen.strategies", ["-c", "import vcegen.strategies"], HEAVY_MODULES, 50),
+    ("cli --help", ["vcegen.py", "--help"], HEAVY_MODULES, 100),
+    ("import StandardStrategy", ["-c", "from vcegen.strategies import StandardStrategy"],
+     ["pandas", "pymupdf", "wordninja"], 400),
+    ("import TripleColumnStrategy", ["-c", "from vcegen.strategies import TripleColumnStrategy"],
+     ["pandas", "pymupdf", "wordninja"], 400),
+    ("import PyMuPDFStrategy", ["-c", "from vcegen.strategies import PyMuPDFStrategy"],
+     ["pandas", "pdfplumber", "wordninja"], 400),
+]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(args: list[str]):
+    process = subprocess.run([sys.executable, "-X", "importtime", *args],
+                             cwd=ROOT,
+                             capture_output=True,
+                             text=True)
+
+    total_us = 0
+    modules = set()
+
+    for line in process.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+
+        if not match:
+            continue
+
+        modules.add(match.group(4))
+
+        # only top-level entries, their cumulative time already includes nested imports
+        if len(match.group(3)) == 1:
+            total_us += int(match.group(2))
+
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", help="Number of runs per scenario (the fastest run is reported)", type=int, default=5)
+    parser.add_argument("--budget-scale", help="Multiplier applied to every time budget", type=float, default=1.0)
+    args = parser.parse_args()
+
+    failures = []
+
+    for name, command, forbidden, budget_ms in SCENARIOS:
+        runs = [measure(command) for _ in range(args.repeat)]
+        elapsed_ms = min(elapsed for elapsed, _ in runs)
+        modules = runs[0][1]
+        leaked = [m for m in forbidden if m in modules]
+        budget_ms *= args.budget_scale
+
+        print(f"{name:<32} {elapsed_ms:8.1f} ms (budget: {budget_ms:.0f} ms)")
+
+        if leaked:
+            failures.append(f"{name}: imported {', '.join(leaked)}")
+
+        if elapsed_ms > budget_ms:
+            failures.append(f"{name}: took {elapsed_ms:.1f} ms, budget is {budget_ms:.0f} ms")
+
+    if failures:
+        print("\nImport-time regressions:")
+
+        for failure in failures:
+            print(f"  {failure}")
+
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
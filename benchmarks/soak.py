@@ -0,0 +1,125 @@
+"""
+Soak test for the REST API.
+
+Sends many requests to the app in-process and fails if the resident set size or
+the number of open file descriptors keeps growing once the server has warmed up.
+
+Usage:
+    python benchmarks/soak.py [--requests 2000] [--pdf demo/test2.pdf] [--max-rss-growth-mb 32]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def get_rss_mb():
+    # /proc is only available on Linux; elsewhere fall back to the peak RSS
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def get_open_files():
+    for path in ["/proc/self/fd", "/dev/fd"]:
+        if os.path.isdir(path):
+            return len(os.listdir(path))
+
+    return -1
+
+
+def sample():
+    gc.collect()
+    return get_rss_mb(), get_open_files()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", help="Number of requests to send (default: 2000)", type=int, default=2000)
+    parser.add_argument("--warmup", help="Number of requests to send before taking the baseline (default: 200)", type=int, default=200)
+    parser.add_argument("--pdf", help="PDF file to upload (default: a generated one-page PDF)", default=None)
+    parser.add_argument("--strategies", help="Comma-separated strategies to cycle through", default="standard,triplecolumn,pymupdf")
+    parser.add_argument("--max-rss-growth-mb", help="Allowed RSS growth after warm-up (default: 32)", type=float, default=32)
+    parser.add_argument("--max-fd-growth", help="Allowed growth in open file descriptors after warm-up (default: 0)", type=int, default=0)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from vcegen.restapi import app
+    from vcegen.utils.warmup import SAMPLE_TABLES, build_sample_pdf
+
+    strategies = args.strategies.split(",")
+    documents = {}
+
+    for name in strategies:
+        if args.pdf is not None:
+            with open(args.pdf, "rb") as file:
+                documents[name] = file.read()
+        else:
+            documents[name] = build_sample_pdf(SAMPLE_TABLES[name])
+
+    with TestClient(app) as client:
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.1)
+
+        def send(idx: int):
+            name = strategies[idx % len(strategies)]
+            response = client.post("/analyze",
+                                   files={ "file": (f"{name}.pdf", documents[name], "application/pdf") },
+                                   data={ "strategy": name })
+
+            if response.status_code != 200:
+                raise SystemExit(f"Request #{idx} ({name}) failed with {response.status_code}: {response.text}")
+
+        for idx in range(args.warmup):
+            send(idx)
+
+        baseline_rss, baseline_fds = sample()
+        samples = []
+        started_at = time.perf_counter()
+
+        for idx in range(args.requests):
+            send(idx)
+
+            if (idx + 1) % max(args.requests // 10, 1) == 0:
+                samples.append((idx + 1, *sample()))
+
+        elapsed = time.perf_counter() - started_at
+
+    print(f"Sent {args.requests} requests in {elapsed:.1f}s ({args.requests / elapsed:.1f} req/s)")
+    print(f"Baseline: {baseline_rss:.1f} MB RSS, {baseline_fds} open files")
+
+    for count, rss, fds in samples:
+        print(f"  after {count:>6} requests: {rss:8.1f} MB RSS ({rss - baseline_rss:+.1f}), {fds} open files ({fds - baseline_fds:+d})")
+
+    final_rss, final_fds = samples[-1][1], samples[-1][2]
+    failures = []
+
+    if final_rss - baseline_rss > args.max_rss_growth_mb:
+        failures.append(f"RSS grew by {final_rss - baseline_rss:.1f} MB (allowed: {args.max_rss_growth_mb} MB)")
+
+    if final_fds - baseline_fds > args.max_fd_growth:
+        failures.append(f"Open files grew by {final_fds - baseline_fds} (allowed: {args.max_fd_growth})")
+
+    if failures:
+        print("\nSoak test failed:")
+
+        for failure in failures:
+            print(f"  {failure}")
+
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
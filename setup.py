@@ -12,6 +12,10 @@ setup(
     version="0.1.0",
     description="Python library for generating VCE-ready files from PDFs",
     url="https://github.com/starkfire/vcegen",
-    packages=find_packages(exclude=['demo', 'docs', 'tests']),
-    install_requires=requirements
+    packages=find_packages(exclude=['demo', 'docs', 'tests', 'benchmarks']),
+    install_requires=requirements,
+    extras_require={
+        # Parquet/Feather output of `to_frame()`
+        "arrow": ["pyarrow"]
+    }
 )
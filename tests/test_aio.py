@@ -0,0 +1,73 @@
+import asyncio
+import os
+import threading
+import time
+import pytest
+import vcegen.strategies.standard as standard
+from vcegen.strategies import StandardStrategy
+
+TEST2 = os.path.join(os.path.dirname(__file__), "..", "demo", "test2.pdf")
+
+
+def test_arun_matches_run():
+    parser = StandardStrategy(TEST2, boxed_choices=True)
+    parser.run(1, 3)
+    expected = parser.result
+
+    assert len(expected) > 0
+    assert asyncio.run(StandardStrategy(TEST2, boxed_choices=True).arun(1, 3)) == expected
+
+
+@pytest.mark.parametrize("is_coroutine", [False, True])
+def test_arun_reports_progress(is_coroutine):
+    progress = []
+
+    def on_progress(done: int, total: int):
+        progress.append((done, total))
+
+    async def on_progress_async(done: int, total: int):
+        await asyncio.sleep(0)
+        progress.append((done, total))
+
+    parser = StandardStrategy(TEST2, boxed_choices=True)
+    asyncio.run(parser.arun(1, 3, on_progress=on_progress_async if is_coroutine else on_progress))
+
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_cancel_waits_for_the_page_being_read(monkeypatch):
+    events = []
+    started = threading.Event()
+    scan_page = StandardStrategy._StandardStrategy__scan_page
+    close_pdf = standard.close_pdf
+
+    def slow_scan_page(self, page, rows):
+        events.append("scan")
+        started.set()
+        time.sleep(0.5)
+        scan_page(self, page, rows)
+        events.append("scanned")
+
+    def recording_close_pdf(pdf):
+        events.append("close")
+        close_pdf(pdf)
+
+    monkeypatch.setattr(StandardStrategy, "_StandardStrategy__scan_page", slow_scan_page)
+    monkeypatch.setattr(standard, "close_pdf", recording_close_pdf)
+
+    async def cancel_mid_document():
+        task = asyncio.create_task(StandardStrategy(TEST2, boxed_choices=True).arun(1, 5))
+
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_mid_document())
+
+    # the page that was being read finishes before the PDF is closed, and no
+    # further pages are read
+    assert events == ["scan", "scanned", "close"]
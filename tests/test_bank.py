@@ -0,0 +1,55 @@
+import pytest
+from vcegen.bank import QuestionBank
+
+
+def make_row(number: int, text: str):
+    return {
+        "question_number": str(number),
+        "question_text": text,
+        "answer": "A",
+        "choices": ["A. yes", "B. no", "C. maybe"],
+        "rationale": ["Because"]
+    }
+
+
+@pytest.fixture
+def bank(tmp_path):
+    with QuestionBank(str(tmp_path / "bank.db"), batch_size=2) as bank:
+        yield bank
+
+
+def test_search_with_punctuation(bank):
+    bank.add_questions([make_row(1, "What's the brachial plexus?"),
+                        make_row(2, "Which nerve leaves plexus 5?"),
+                        make_row(3, "Name the \"funny\" bone")], "anatomy.pdf")
+
+    assert [q["question_number"] for q in bank.search("what's")] == ["1"]
+    assert [q["question_number"] for q in bank.search("plexus 5?")] == ["2"]
+    assert [q["question_number"] for q in bank.search('"funny"')] == ["3"]
+    assert bank.search("AND (") == []
+
+
+def test_failed_ingest_keeps_previous_questions(bank):
+    bank.add_questions([make_row(1, "First"), make_row(2, "Second")], "anatomy.pdf")
+
+    def rows():
+        yield from [make_row(1, "Replaced"), make_row(2, "Replaced"), make_row(3, "Replaced")]
+        raise RuntimeError("parser failed")
+
+    with pytest.raises(RuntimeError):
+        bank.add_questions(rows(), "anatomy.pdf")
+
+    assert [q["question_text"] for q in bank.search(source="anatomy.pdf")] == ["First", "Second"]
+    assert bank.sources()[0]["questions"] == 2
+
+
+def test_pdf_and_export_are_the_same_document(bank, tmp_path):
+    bank.add_questions([make_row(1, "From the PDF")], "demo/anatomy.pdf", "StandardStrategy")
+
+    export = tmp_path / "anatomy.txt"
+    export.write_text("Question NO: 1\nFrom the export\n\nA. yes\nB. no\nC. maybe\nAnswer: A\n")
+    bank.ingest_file(str(export))
+
+    assert [source["name"] for source in bank.sources()] == ["anatomy"]
+    assert [q["question_text"] for q in bank.search(source="anatomy.pdf")] == ["From the export"]
+    assert [q["question_text"] for q in bank.search(source="anatomy")] == ["From the export"]
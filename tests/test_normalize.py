@@ -0,0 +1,49 @@
+import os
+import time
+from io import BytesIO
+from vcegen.utils.normalize import evict_cache, get_normalized_pdf
+from vcegen.utils.warmup import SAMPLE_TABLES, build_sample_pdf
+
+
+def test_in_memory_sources_are_not_cached(tmp_path):
+    data = build_sample_pdf(SAMPLE_TABLES["standard"])
+    result = get_normalized_pdf(BytesIO(data), cache_dir=str(tmp_path))
+
+    assert result.path is None
+    assert result.source.read().startswith(b"%PDF")
+    assert os.listdir(tmp_path) == []
+
+
+def test_files_are_cached(tmp_path):
+    source = tmp_path / "exam.pdf"
+    source.write_bytes(build_sample_pdf(SAMPLE_TABLES["standard"]))
+    cache_dir = tmp_path / "cache"
+
+    first = get_normalized_pdf(str(source), cache_dir=str(cache_dir))
+    second = get_normalized_pdf(str(source), cache_dir=str(cache_dir))
+
+    assert not first.cached
+    assert second.cached
+    assert second.path == first.path
+
+
+def test_evict_cache_removes_least_recently_used(tmp_path):
+    now = time.time()
+
+    for age, name in enumerate(["newest", "middle", "oldest"]):
+        path = tmp_path / f"{name}.pdf"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (now - age * 60, now - age * 60))
+
+    evict_cache(str(tmp_path), max_size=150)
+
+    assert sorted(os.listdir(tmp_path)) == ["newest.pdf"]
+
+
+def test_evict_cache_keeps_the_new_entry(tmp_path):
+    big = tmp_path / "big.pdf"
+    big.write_bytes(b"x" * 300)
+
+    evict_cache(str(tmp_path), max_size=100, keep=str(big))
+
+    assert big.exists()
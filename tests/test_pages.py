@@ -0,0 +1,61 @@
+import asyncio
+import os
+import pytest
+from pdfplumber.page import Page
+from vcegen.strategies import PyMuPDFStrategy, StandardStrategy
+from vcegen.utils.pages import normalize_page_range
+
+TEST6 = os.path.join(os.path.dirname(__file__), "..", "demo", "test6.pdf")
+
+
+@pytest.mark.parametrize("start_page, end_page, expected", [
+    (None, None, range(0, 43)),
+    (2, 4, range(1, 4)),
+    (40, 60, range(39, 43)),
+    (0, 1, range(0, 1)),
+    (50, 60, range(0)),
+    (44, None, range(0)),
+    (5, 3, range(0)),
+])
+def test_normalize_page_range(start_page, end_page, expected):
+    assert normalize_page_range(43, start_page, end_page) == expected
+
+
+def test_run_past_the_last_page_parses_nothing():
+    strategy = StandardStrategy(TEST6)
+    strategy.run(50, 60)
+
+    assert strategy.result == []
+
+
+def test_pymupdf_inverted_range_parses_nothing():
+    with PyMuPDFStrategy(TEST6) as strategy:
+        strategy.run(5, 3)
+
+    assert strategy.result == []
+
+
+@pytest.fixture
+def created_pages(monkeypatch):
+    page_numbers = []
+    init = Page.__init__
+
+    def counting_init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        page_numbers.append(self.page_number)
+
+    monkeypatch.setattr(Page, "__init__", counting_init)
+
+    return page_numbers
+
+
+def test_run_only_creates_the_requested_pages(created_pages):
+    StandardStrategy(TEST6).run(1, 2)
+
+    assert created_pages == [1, 2]
+
+
+def test_arun_only_creates_the_requested_pages(created_pages):
+    asyncio.run(StandardStrategy(TEST6).arun(3, 4))
+
+    assert created_pages == [3, 4]
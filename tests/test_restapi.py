@@ -0,0 +1,115 @@
+import csv
+import io
+import os
+import time
+import pytest
+from fastapi.testclient import TestClient
+import vcegen.restapi as restapi
+
+TEST2 = os.path.join(os.path.dirname(__file__), "..", "demo", "test2.pdf")
+
+
+def wait_for_warm_up(client: TestClient, timeout=30):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        response = client.get("/ready")
+
+        if response.status_code == 200 or response.json()["error"] is not None:
+            return response
+
+        time.sleep(0.05)
+
+    pytest.fail("warm-up did not finish")
+
+
+def test_ready_after_warm_up(monkeypatch):
+    monkeypatch.setattr(restapi, "warm_up", lambda: {"imports": 0.0})
+
+    with TestClient(restapi.app) as client:
+        response = wait_for_warm_up(client)
+
+    assert response.status_code == 200
+    assert response.json() == {"ready": True, "warmup": {"imports": 0.0}}
+
+
+def test_not_ready_when_warm_up_fails(monkeypatch):
+    def warm_up():
+        raise RuntimeError("broken")
+
+    monkeypatch.setattr(restapi, "warm_up", warm_up)
+
+    with TestClient(restapi.app) as client:
+        response = wait_for_warm_up(client)
+
+    assert response.status_code == 503
+    assert response.json() == {"ready": False, "error": "RuntimeError: broken"}
+
+
+def test_analyze_does_not_print(monkeypatch, capsys):
+    monkeypatch.setattr(restapi, "warm_up", lambda: {})
+
+    with open(TEST2, "rb") as file:
+        data = file.read()
+
+    with TestClient(restapi.app) as client:
+        response = client.post("/analyze",
+                               files={ "file": ("test2.pdf", data, "application/pdf") },
+                               data={ "strategy": "standard", "boxed_choices": "true" })
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) > 0
+    assert capsys.readouterr().out == ""
+
+
+def test_analyze_normalizes_uploads_in_memory(monkeypatch, tmp_path):
+    monkeypatch.setattr(restapi, "warm_up", lambda: {})
+    monkeypatch.setenv("VCEGEN_CACHE_DIR", str(tmp_path))
+
+    with open(TEST2, "rb") as file:
+        data = file.read()
+
+    with TestClient(restapi.app) as client:
+        response = client.post("/analyze",
+                               files={ "file": ("test2.pdf", data, "application/pdf") },
+                               data={ "strategy": "standard", "boxed_choices": "true", "normalize": "true" })
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) > 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_export_matches_validate(monkeypatch):
+    monkeypatch.setattr(restapi, "warm_up", lambda: {})
+
+    with open(TEST2, "rb") as file:
+        data = file.read()
+
+    with TestClient(restapi.app) as client:
+        analyzed = client.post("/analyze",
+                               files={ "file": ("test2.pdf", data, "application/pdf") },
+                               data={ "strategy": "standard", "boxed_choices": "true" })
+        exported = client.post("/export",
+                               files={ "file": ("test2.pdf", data, "application/pdf") },
+                               data={ "strategy": "standard", "boxed_choices": "true", "format": "csv" })
+
+    assert exported.status_code == 200
+    rows = list(csv.reader(io.StringIO(exported.text)))[1:]
+    assert len(rows) == len(analyzed.json()["results"])
+    assert all(row[0] and row[1] for row in rows)
+
+
+def test_analyze_returns_export(monkeypatch):
+    monkeypatch.setattr(restapi, "warm_up", lambda: {})
+
+    with open(TEST2, "rb") as file:
+        data = file.read()
+
+    with TestClient(restapi.app) as client:
+        response = client.post("/analyze",
+                               files={ "file": ("test2.pdf", data, "application/pdf") },
+                               data={ "strategy": "standard", "boxed_choices": "true", "export": "true" })
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="test2.txt"'
+    assert response.text.count("Question NO: ") == 99
@@ -0,0 +1,50 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import vcegen.strategies.pymupdf as pymupdf_strategy
+from vcegen.restapi import count_document_pages
+from vcegen.strategies import PyMuPDFStrategy, StandardStrategy
+from vcegen.utils.mupdf import MUPDF_LOCK
+from vcegen.utils.warmup import SAMPLE_TABLES, build_sample_pdf
+
+
+def test_pymupdf_post_processing_runs_without_the_lock(monkeypatch):
+    locked = []
+
+    def correct_spacing(text: str):
+        locked.append(MUPDF_LOCK.locked())
+        return text
+
+    monkeypatch.setattr(pymupdf_strategy, "correct_spacing", correct_spacing)
+    result = PyMuPDFStrategy.configure().parse(build_sample_pdf(SAMPLE_TABLES["pymupdf"]))
+
+    assert len(result.questions) == 1
+    assert locked == [False]
+
+
+def test_blacklist_is_a_mutable_list():
+    data = build_sample_pdf(SAMPLE_TABLES["standard"])
+    parser = StandardStrategy.configure()
+    question_numbers = lambda: [question.question_number for question in parser.parse(data).questions]
+
+    assert parser.blacklist == []
+    assert "1" in question_numbers()
+
+    parser.blacklist.append("WHAT IS WARM")
+
+    assert "1" not in question_numbers()
+
+
+def test_helpers_wait_for_the_lock():
+    data = build_sample_pdf(SAMPLE_TABLES["standard"])
+
+    with ThreadPoolExecutor() as executor:
+        with MUPDF_LOCK:
+            futures = [executor.submit(count_document_pages, data),
+                       executor.submit(build_sample_pdf, SAMPLE_TABLES["standard"])]
+
+            # neither helper can touch MuPDF while another parser holds the lock
+            time.sleep(0.5)
+            assert not any(future.done() for future in futures)
+
+        assert futures[0].result(timeout=10) == 1
+        assert futures[1].result(timeout=10).startswith(b"%PDF")
@@ -0,0 +1,55 @@
+import pymupdf
+import pytest
+from vcegen.utils.triage import triage_source
+from vcegen.utils.warmup import SAMPLE_TABLES, build_sample_pdf
+
+TEXT_SETTINGS = {"vertical_strategy": "text", "horizontal_strategy": "text"}
+
+
+def build_borderless_pdf() -> bytes:
+    # a question table laid out with whitespace only, as found by the "text" strategies
+    document = pymupdf.open()
+    page = document.new_page()
+
+    for row_idx, row in enumerate([["1.", "What is warm?", "A. hot", "A"],
+                                   ["", "", "B. cold", ""],
+                                   ["", "", "C. ice", ""]]):
+        for col_idx, text in enumerate(row):
+            page.insert_text((40 + col_idx * 120, 60 + row_idx * 20), text, fontsize=9)
+
+    data = document.tobytes()
+    document.close()
+
+    return data
+
+
+def test_page_without_grid_is_skipped_for_line_settings():
+    (triage,) = triage_source(build_borderless_pdf())
+
+    assert not triage.keep
+    assert triage.reason == "no table grid"
+
+
+@pytest.mark.parametrize("table_settings, keep", [
+    (TEXT_SETTINGS, True),
+    # the vertical ruling lines are still required
+    ({"vertical_strategy": "lines", "horizontal_strategy": "text"}, False),
+])
+def test_grid_check_follows_table_settings(table_settings, keep):
+    (triage,) = triage_source(build_borderless_pdf(), table_settings=table_settings)
+
+    assert triage.keep == keep
+
+
+def test_strategy_triage_uses_its_table_settings():
+    from vcegen.strategies import StandardStrategy
+
+    result = StandardStrategy.configure(triage=True, table_settings=TEXT_SETTINGS).parse(build_borderless_pdf())
+
+    assert result.skipped_pages == ()
+
+
+def test_grid_page_is_kept():
+    (triage,) = triage_source(build_sample_pdf(SAMPLE_TABLES["standard"]))
+
+    assert triage.keep
@@ -0,0 +1,51 @@
+import os
+import vcegen.utils.tuning as tuning
+from vcegen.strategies import StandardStrategy
+from vcegen.utils.pages import open_pdf
+from vcegen.utils.tuning import DEFAULT_TABLE_SETTINGS, get_sample_pages, tune_table_settings
+
+TEST6 = os.path.join(os.path.dirname(__file__), "..", "demo", "test6.pdf")
+
+FASTER = {**DEFAULT_TABLE_SETTINGS, "snap_tolerance": 5}
+
+
+def test_sample_pages_follow_start_page_and_triage():
+    with open_pdf(TEST6) as pdf:
+        pages = get_sample_pages(pdf, 3, start_page=5, skipped_page_numbers=[6])
+
+        assert [page.page_number for page in pages] == [5, 7, 8]
+
+
+def test_tie_is_decided_by_median_time(monkeypatch):
+    # a single lucky run must not replace the defaults
+    timings = {
+        "defaults": iter([0.10, 0.05, 0.05, 0.05, 0.05]),
+        "faster": iter([0.01, 0.10, 0.10, 0.10, 0.10]),
+    }
+
+    def time_evaluation(evaluate, settings):
+        return evaluate(settings), next(timings["defaults" if settings == DEFAULT_TABLE_SETTINGS else "faster"])
+
+    monkeypatch.setattr(tuning, "time_evaluation", time_evaluation)
+    row = {"question_text": "Q", "answer": "A", "choices": ["A", "B", "C"]}
+    results = tune_table_settings(lambda settings: [row], [DEFAULT_TABLE_SETTINGS, FASTER])
+
+    assert results[0].settings == DEFAULT_TABLE_SETTINGS
+    assert [candidate.elapsed for candidate in results] == [0.05, 0.10]
+
+
+def test_tune_samples_the_requested_pages(monkeypatch):
+    sampled = []
+    get_pages = tuning.get_pages
+
+    def recording_get_pages(pdf, page_indices):
+        pages = get_pages(pdf, page_indices)
+        sampled.extend(page.page_number for page in pages)
+        return pages
+
+    monkeypatch.setattr(tuning, "get_pages", recording_get_pages)
+    strategy = StandardStrategy(TEST6)
+    results = strategy.tune(sample_pages=2, candidates=[DEFAULT_TABLE_SETTINGS], start_page=10)
+
+    assert sampled == [10, 11]
+    assert results[0].valid > 0
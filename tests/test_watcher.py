@@ -0,0 +1,93 @@
+import json
+import os
+import time
+from vcegen.watcher import CLAIMED_DIR, SpoolWatcher
+
+
+def test_recover_claims_requeues_stale_claims(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    watcher = SpoolWatcher(str(inbox), str(tmp_path / "outbox"), claim_timeout=60)
+
+    # a claim left behind by a worker that died an hour ago
+    dead_worker = inbox / CLAIMED_DIR / "host-1"
+    dead_worker.mkdir()
+    stale = dead_worker / "stale.pdf"
+    stale.write_bytes(b"%PDF")
+    os.utime(stale, (time.time() - 3600, time.time() - 3600))
+
+    # a claim that a live worker is still working on
+    live_worker = inbox / CLAIMED_DIR / "host-2"
+    live_worker.mkdir()
+    (live_worker / "fresh.pdf").write_bytes(b"%PDF")
+
+    assert watcher.recover_claims() == 1
+    assert (inbox / "stale.pdf").exists()
+    assert (live_worker / "fresh.pdf").exists()
+
+    # the directory of the dead worker is removed once it has been empty for `claim_timeout`
+    os.utime(dead_worker, (time.time() - 3600, time.time() - 3600))
+
+    assert watcher.recover_claims() == 0
+    assert not dead_worker.exists()
+    assert live_worker.exists()
+
+
+def test_claim_records_claim_time(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    watcher = SpoolWatcher(str(inbox), str(tmp_path / "outbox"), claim_timeout=60)
+
+    path = inbox / "old.pdf"
+    path.write_bytes(b"%PDF")
+    os.utime(path, (time.time() - 3600, time.time() - 3600))
+
+    claimed_path = watcher.claim("old.pdf")
+
+    assert claimed_path == os.path.join(watcher.claimed, "old.pdf")
+    assert watcher.recover_claims() == 0
+
+
+def test_workers_can_claim_after_recovering(tmp_path, monkeypatch):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    watchers = []
+
+    for pid in [1, 2]:
+        monkeypatch.setattr(os, "getpid", lambda: pid)
+        watchers.append(SpoolWatcher(str(inbox), str(tmp_path / "outbox"), claim_timeout=60))
+
+    for watcher in watchers:
+        watcher.recover_claims()
+
+    # an idle worker whose directory was removed by another worker recreates it
+    os.utime(watchers[1].claimed, (time.time() - 3600, time.time() - 3600))
+    watchers[0].recover_claims()
+
+    for idx, watcher in enumerate(watchers):
+        (inbox / f"{idx}.pdf").write_bytes(b"%PDF")
+
+        assert watcher.claim(f"{idx}.pdf") == os.path.join(watcher.claimed, f"{idx}.pdf")
+
+
+def test_recover_claims_quarantines_after_max_attempts(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    watcher = SpoolWatcher(str(inbox), str(tmp_path / "outbox"), claim_timeout=60, max_attempts=3)
+    (inbox / "crash.pdf").write_bytes(b"%PDF")
+
+    for attempt in range(3):
+        # the worker dies while parsing the file
+        claimed_path = watcher.claim("crash.pdf")
+        os.utime(claimed_path, (time.time() - 3600, time.time() - 3600))
+
+        assert watcher.recover_claims() == 1
+
+    assert not (inbox / "crash.pdf").exists()
+    assert os.path.exists(os.path.join(watcher.quarantine, "crash.pdf"))
+
+    with open(tmp_path / "outbox" / "crash.json") as file:
+        status = json.load(file)
+
+    assert status["status"] == "failed"
+    assert status["attempts"] == 3
@@ -0,0 +1,34 @@
+import random
+import wordninja
+from vcegen.utils.wordcost import SharedLanguageModel, build_table
+
+CORPUS = [
+    "",
+    "thequickbrownfoxjumpsoverthelazydog",
+    "ThePatientWasAdmittedToTheICU",
+    "whichtransverseabdominalplanetransectsthelowerborderofthe10thrib",
+    "don'tworryit'sfine",
+    "patient'sbloodpressurewas120over80",
+    "COVID19vaccinationat2doses",
+    "cafédéjàvunaïvecoöperation",
+    "straße über größe",
+    "Αβγdeltaepsilon",
+    "x2yz3 a.b,c;d-e_f",
+    "''''",
+    "123456",
+    "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+]
+
+
+def test_split_matches_wordninja(tmp_path):
+    model = SharedLanguageModel(build_table(str(tmp_path / "wordcost.bin")))
+
+    # ordinary text with the spaces removed, plus random junk
+    rng = random.Random(0)
+    words = "the of and heart lung rib plane nerve artery ulnar median 5th L1 can't".split()
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCXYZ0123456789'-é ñ"
+    corpus = CORPUS + ["".join(rng.choices(words, k=rng.randint(1, 12))) for _ in range(200)]
+    corpus += ["".join(rng.choices(alphabet, k=rng.randint(1, 40))) for _ in range(200)]
+
+    for text in corpus:
+        assert model.split(text) == wordninja.split(text), text
@@ -1,13 +1,12 @@
 import argparse
-from vcegen.strategies import StandardStrategy, PyMuPDFStrategy, TripleColumnStrategy
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
 
     parser.add_argument("--strategy", 
                         '-s', 
-                        help="Parsing Strategy to use (`pymupdf` | `standard` | `triplecolumn` | `boxedchoices`) (default: `standard`)",
-                        default="standard"
+                        help="Parsing Strategy to use (`pymupdf` | `standard` | `triplecolumn` | `boxedchoices`) (default: `standard`, or `auto` with --watch)",
+                        default=None
     )
     parser.add_argument("--input", 
                         '-i', 
@@ -40,9 +39,67 @@ if __name__ == "__main__":
                         help="Apply sentence corrections",
                         action=argparse.BooleanOptionalAction,
                         default=False)
+    parser.add_argument("--triage",
+                        help="Skip pages without a question table (cover pages, instructions, answer keys) before table extraction",
+                        action=argparse.BooleanOptionalAction,
+                        default=False)
+    parser.add_argument("--normalize",
+                        help="Clean up the PDF with PyMuPDF before parsing; the cleaned copy is cached by content (`standard` and `triplecolumn` only)",
+                        action=argparse.BooleanOptionalAction,
+                        default=False)
+    parser.add_argument("--tune",
+                        help="Search for the pdfplumber table settings that parse the first pages best, and use them for the whole document (`standard` and `triplecolumn` only)",
+                        action=argparse.BooleanOptionalAction,
+                        default=False)
+    parser.add_argument("--table-settings",
+                        help="JSON file with pdfplumber table settings to use; with --tune, the best settings are saved to this file instead",
+                        default=None)
+
+    parser.add_argument("--profile",
+                        help="Profile the parser, and write a report of the slowest pages and functions (`<name>.profile.txt`) and a flamegraph-compatible collapsed-stack file (`<name>.collapsed`) to the current directory, where `<name>` is the input file name without its extension",
+                        action=argparse.BooleanOptionalAction,
+                        default=False)
+
+    parser.add_argument("--bank",
+                        help="Store the parsed questions in a SQLite question bank at the given path",
+                        default=None)
+    parser.add_argument("--watch",
+                        '-w',
+                        help="Watch an inbox directory for PDF files and write the exports to an outbox directory",
+                        nargs=2,
+                        metavar=("INBOX", "OUTBOX"),
+                        default=None)
+    parser.add_argument("--workers",
+                        help="Number of worker processes to run with --watch (default: 1)",
+                        type=int,
+                        default=1)
+    parser.add_argument("--quarantine",
+                        help="Directory where PDF files that fail to parse are moved to with --watch (default: `<OUTBOX>/quarantine`)",
+                        default=None)
 
     args = parser.parse_args()
 
+    if args.watch:
+        from vcegen.watcher import run_workers
+
+        if args.strategy not in [None, "auto", "triplecolumn", "standard", "pymupdf"]:
+            print("Please provide a valid strategy. Strategies include `auto`, `triplecolumn`, `standard`, and `pymupdf`")
+            raise SystemExit(1)
+
+        run_workers(args.watch[0],
+                    args.watch[1],
+                    workers=args.workers,
+                    strategy=None if args.strategy in [None, "auto"] else args.strategy,
+                    quarantine=args.quarantine,
+                    boxed_choices=args.boxedchoices,
+                    exclude_rationale=args.exclude_rationale,
+                    apply_corrections=args.apply_corrections,
+                    debug=args.debug)
+        raise SystemExit(0)
+
+    if args.strategy is None:
+        args.strategy = "standard"
+
     if not args.input:
         print("Please provide an input PDF file")
         raise SystemExit(1)
@@ -51,30 +108,102 @@ if __name__ == "__main__":
         print("Please provide a valid strategy. Strategies include `triplecolumn`, `standard`, and `pymupdf`")
         raise SystemExit(1)
 
+    if (args.tune or args.table_settings) and args.strategy == "pymupdf":
+        print("Table settings can only be tuned for the `standard` and `triplecolumn` strategies")
+        raise SystemExit(1)
+
+    if args.normalize and args.strategy == "pymupdf":
+        print("Normalization is only supported by the `standard` and `triplecolumn` strategies")
+        raise SystemExit(1)
+
+    table_settings = None
+
+    if args.table_settings and not args.tune:
+        from vcegen.utils.tuning import load_table_settings
+
+        table_settings = load_table_settings(args.table_settings)
+
+    # the strategies pull in the PDF libraries, so only import them once the
+    # arguments are known to be valid
+    from vcegen.strategies import StandardStrategy, PyMuPDFStrategy, TripleColumnStrategy
+
     strategy: StandardStrategy | PyMuPDFStrategy | TripleColumnStrategy | None = None
 
     if args.strategy == "triplecolumn":
         strategy = TripleColumnStrategy(args.input, 
                                         exclude_rationale=args.exclude_rationale,
-                                        apply_corrections=args.apply_corrections)
+                                        apply_corrections=args.apply_corrections,
+                                        triage=args.triage,
+                                        table_settings=table_settings,
+                                        normalize=args.normalize,
+                                        debug=args.debug)
 
     if args.strategy == "standard":
         strategy = StandardStrategy(args.input, 
                                     boxed_choices=args.boxedchoices,
                                     exclude_rationale=args.exclude_rationale,
-                                    apply_corrections=args.apply_corrections)
+                                    apply_corrections=args.apply_corrections,
+                                    triage=args.triage,
+                                    table_settings=table_settings,
+                                    normalize=args.normalize,
+                                    debug=args.debug)
 
     if args.strategy == "pymupdf":
         strategy = PyMuPDFStrategy(args.input, 
                                    exclude_rationale=args.exclude_rationale,
-                                   apply_corrections=args.apply_corrections)
+                                   apply_corrections=args.apply_corrections,
+                                   triage=args.triage,
+                                   debug=args.debug)
 
     if strategy is not None:
-        strategy.run()
+        if args.tune and not isinstance(strategy, PyMuPDFStrategy):
+            from vcegen.utils.tuning import print_tuning, save_table_settings
+
+            tuning = strategy.tune()
+
+            # debug mode already prints every candidate
+            if not args.debug:
+                print_tuning(tuning)
+            print(f"Using table settings: {strategy.table_settings}")
+
+            if args.table_settings and strategy.table_settings is not None:
+                save_table_settings(args.table_settings, strategy.table_settings, args.strategy)
+                print(f"Saved table settings to {args.table_settings}")
+
+        if args.profile:
+            import os
+            from vcegen.utils.profiling import Profiler
+
+            with Profiler() as profiler:
+                strategy.run()
+
+            stem = os.path.splitext(os.path.basename(args.input))[0]
+            profiler.write_report(f"{stem}.profile.txt")
+            profiler.write_collapsed(f"{stem}.collapsed")
+        else:
+            strategy.run()
+
         strategy.get_results()
 
+        if args.triage:
+            from vcegen.utils.triage import describe_triage
+
+            for triage in strategy.skipped_pages:
+                print(f"Skipped {describe_triage(triage)}")
+
         if not isinstance(strategy, PyMuPDFStrategy):
             strategy.validate()
 
         if args.export:
             strategy.export()
+
+        if args.bank:
+            from vcegen.bank import QuestionBank
+
+            with QuestionBank(args.bank) as bank:
+                count = bank.add_strategy_results(strategy)
+                print(f"Stored {count} questions in {args.bank}")
+
+        if args.profile:
+            print(f"\n{profiler.report()}")
+            print(f"Wrote profile to {stem}.profile.txt and {stem}.collapsed")
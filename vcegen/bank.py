@@ -0,0 +1,319 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Iterable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    strategy TEXT,
+    ingested_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question_number TEXT,
+    question_text TEXT,
+    answer TEXT
+);
+
+CREATE TABLE IF NOT EXISTS choices (
+    question_id INTEGER NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT,
+    PRIMARY KEY (question_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rationales (
+    question_id INTEGER NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT,
+    PRIMARY KEY (question_id, position)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS questions_document ON questions(document_id, position);
+CREATE INDEX IF NOT EXISTS questions_number ON questions(question_number);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+    question_text,
+    content='questions',
+    content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS questions_ai AFTER INSERT ON questions BEGIN
+    INSERT INTO questions_fts(rowid, question_text) VALUES (new.id, new.question_text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS questions_ad AFTER DELETE ON questions BEGIN
+    INSERT INTO questions_fts(questions_fts, rowid, question_text) VALUES ('delete', old.id, old.question_text);
+END;
+"""
+
+NO_RATIONALE = "No associated rationale for choice"
+
+
+def to_match_query(keyword: str) -> str:
+    # every word is quoted as an FTS5 string, so punctuation in ordinary input
+    # (e.g. `what's`, `plexus 5?`) is not read as query syntax; the words are
+    # still matched independently of each other
+    return " ".join('"' + term.replace('"', '""') + '"' for term in keyword.split())
+
+
+def to_source_key(source: str) -> str:
+    # documents are keyed by file name without directory or extension, so a PDF
+    # stored with `--bank` and its exported TXT (or JSON) file are the same document
+    return os.path.splitext(os.path.basename(source))[0]
+
+
+def read_export(path: str) -> list[dict]:
+    # reverses the VCE TXT layout written by the strategies' `export()` methods
+    with open(path) as file:
+        text = file.read()
+
+    rows = []
+
+    for block in re.split(r"^Question NO: ", text, flags=re.M)[1:]:
+        question_number, _, rest = block.partition("\n")
+        head, _, tail = rest.partition("\nAnswer: ")
+        parts = head.strip("\n").split("\n\n", 1)
+        choices = [line for line in parts[1].splitlines() if line] if len(parts) > 1 else []
+        answer, _, tail = tail.partition("\n")
+        rationale = []
+
+        if "Rationale:\n" in tail:
+            lines = tail.split("Rationale:\n", 1)[1].strip("\n").splitlines()
+
+            for choice, line in zip(choices, lines):
+                value = line[len(choice) + 2:] if line.startswith(f"{choice}: ") else line
+
+                # placeholders are only written after the last real rationale entry
+                if value == NO_RATIONALE:
+                    break
+
+                rationale.append(value)
+
+        rows.append({
+            "question_number": None if question_number == "None" else question_number.strip(),
+            "question_text": None if parts[0] == "None" else parts[0],
+            "answer": None if answer == "None" else answer,
+            "choices": choices,
+            "rationale": rationale
+        })
+
+    return rows
+
+
+def read_results(path: str) -> list[dict]:
+    if path.lower().endswith(".json"):
+        with open(path) as file:
+            return json.load(file)
+
+    return read_export(path)
+
+
+class QuestionBank:
+
+    def __init__(self, path: str, batch_size=5000):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+
+        # WAL lets readers query the bank while a batch is being ingested
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *_):
+        self.close()
+
+
+    def close(self):
+        self.connection.close()
+
+
+    def add_questions(self, rows: Iterable[dict], source: str, strategy: str | None = None):
+        source = to_source_key(source)
+        cursor = self.connection.cursor()
+        count = 0
+
+        # re-ingesting a document replaces its previous questions; everything runs in
+        # one transaction, so a failed batch leaves the previous questions in place
+        # instead of a half-ingested document
+        with self.connection:
+            cursor.execute("DELETE FROM documents WHERE name = ?", (source,))
+            cursor.execute("INSERT INTO documents (name, strategy, ingested_at) VALUES (?, ?, ?)",
+                           (source, strategy, time.time()))
+            document_id = cursor.lastrowid
+            batch = []
+
+            for row in rows:
+                batch.append(row)
+
+                if len(batch) >= self.batch_size:
+                    self.__insert_batch(cursor, document_id, batch, count)
+                    count += len(batch)
+                    batch = []
+
+            if batch:
+                self.__insert_batch(cursor, document_id, batch, count)
+                count += len(batch)
+
+        return count
+
+
+    def __insert_batch(self, cursor: sqlite3.Cursor, document_id: int, rows: list[dict], offset: int):
+        (next_id,) = cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM questions").fetchone()
+        questions = []
+        choices = []
+        rationales = []
+
+        for idx, row in enumerate(rows):
+            question_id = next_id + idx
+            questions.append((question_id,
+                              document_id,
+                              offset + idx,
+                              row.get("question_number"),
+                              row.get("question_text"),
+                              row.get("answer")))
+            choices += [(question_id, pos, text) for pos, text in enumerate(row.get("choices") or [])]
+            rationales += [(question_id, pos, text) for pos, text in enumerate(row.get("rationale") or [])]
+
+        cursor.executemany("INSERT INTO questions (id, document_id, position, question_number, question_text, answer) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", questions)
+        cursor.executemany("INSERT INTO choices (question_id, position, text) VALUES (?, ?, ?)", choices)
+        cursor.executemany("INSERT INTO rationales (question_id, position, text) VALUES (?, ?, ?)", rationales)
+
+
+    def add_strategy_results(self, strategy, source: str | None = None):
+        if source is None:
+            source = strategy.input_file if isinstance(strategy.input_file, str) else "<stream>"
+
+        return self.add_questions(strategy.result or [], source, type(strategy).__name__)
+
+
+    def ingest_file(self, path: str):
+        return self.add_questions(read_results(path), path)
+
+
+    def __assemble(self, records: list[sqlite3.Row]) -> list[dict]:
+        if len(records) == 0:
+            return []
+
+        ids = [record["id"] for record in records]
+        placeholders = ",".join("?" * len(ids))
+        choices: dict[int, list[str]] = {}
+        rationales: dict[int, list[str]] = {}
+
+        for question_id, text in self.connection.execute(
+                f"SELECT question_id, text FROM choices WHERE question_id IN ({placeholders}) "
+                "ORDER BY question_id, position", ids):
+            choices.setdefault(question_id, []).append(text)
+
+        for question_id, text in self.connection.execute(
+                f"SELECT question_id, text FROM rationales WHERE question_id IN ({placeholders}) "
+                "ORDER BY question_id, position", ids):
+            rationales.setdefault(question_id, []).append(text)
+
+        return [{
+            "id": record["id"],
+            "source": record["source"],
+            "question_number": record["question_number"],
+            "question_text": record["question_text"],
+            "answer": record["answer"],
+            "choices": choices.get(record["id"], []),
+            "rationale": rationales.get(record["id"], [])
+        } for record in records]
+
+
+    def search(self,
+               keyword: str | None = None,
+               source: str | None = None,
+               question_number: str | None = None,
+               limit=20):
+        query = ["SELECT q.id, d.name AS source, q.question_number, q.question_text, q.answer",
+                 "FROM questions q JOIN documents d ON d.id = q.document_id"]
+        conditions = []
+        params: list = []
+
+        match_query = to_match_query(keyword) if keyword else ""
+
+        if match_query:
+            query.append("JOIN questions_fts f ON f.rowid = q.id")
+            conditions.append("questions_fts MATCH ?")
+            params.append(match_query)
+
+        if source is not None:
+            conditions.append("d.name = ?")
+            params.append(to_source_key(source))
+
+        if question_number is not None:
+            conditions.append("q.question_number = ?")
+            params.append(str(question_number))
+
+        if conditions:
+            query.append("WHERE " + " AND ".join(conditions))
+
+        query.append("ORDER BY f.rank" if match_query else "ORDER BY d.name, q.position")
+        query.append("LIMIT ?")
+        params.append(limit)
+
+        return self.__assemble(self.connection.execute(" ".join(query), params).fetchall())
+
+
+    def sources(self):
+        return [dict(record) for record in self.connection.execute(
+            "SELECT d.name, d.strategy, COUNT(q.id) AS questions FROM documents d "
+            "LEFT JOIN questions q ON q.document_id = d.id GROUP BY d.id ORDER BY d.name")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m vcegen.bank",
+                                     description="Store and search parsed questions in a SQLite question bank")
+    parser.add_argument("database", help="Path to the SQLite database (created if it does not exist)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Ingest exported TXT files or JSON results")
+    ingest.add_argument("files", nargs="+", help="Paths to exported TXT or JSON files")
+
+    search = commands.add_parser("search", help="Search the question bank")
+    search.add_argument("keyword", nargs="?", default=None, help="Words that every returned question must contain")
+    search.add_argument("--source", help="Only return questions from this source document (file name, with or without extension)", default=None)
+    search.add_argument("--number", help="Only return questions with this question number", default=None)
+    search.add_argument("--limit", help="Maximum number of results (default: 20)", type=int, default=20)
+
+    commands.add_parser("sources", help="List ingested source documents")
+
+    args = parser.parse_args()
+
+    with QuestionBank(args.database) as bank:
+        if args.command == "ingest":
+            for path in args.files:
+                started_at = time.perf_counter()
+                count = bank.ingest_file(path)
+                print(f"Ingested {count} questions from {path} in {time.perf_counter() - started_at:.2f}s")
+
+        if args.command == "search":
+            started_at = time.perf_counter()
+            results = bank.search(args.keyword, args.source, args.number, args.limit)
+
+            for q in results:
+                print(json.dumps(q, indent=2))
+
+            print(f"Found {len(results)} questions in {(time.perf_counter() - started_at) * 1000:.1f}ms")
+
+        if args.command == "sources":
+            for source in bank.sources():
+                print(f"{source['name']} ({source['strategy'] or 'export'}): {source['questions']} questions")
@@ -1,18 +1,57 @@
-from fastapi import FastAPI, BackgroundTasks, Form, File, UploadFile
+from fastapi import FastAPI, Form, File, UploadFile
 from fastapi.exceptions import HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
-from vcegen.strategies import StandardStrategy, PyMuPDFStrategy, TripleColumnStrategy
+from vcegen.strategies import StandardStrategy, PyMuPDFStrategy, TripleColumnStrategy, STRATEGIES, create_strategy
+from vcegen.utils.aio import run_blocking
+from vcegen.utils.results import is_valid_row
+from vcegen.utils.mupdf import MUPDF_LOCK, open_document
+from vcegen.utils.export import EXPORT_FORMATS, aiter_export, aiter_gzip, iter_export
+from vcegen.utils.warmup import warm_up
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from dataclasses import asdict
 import asyncio
 import os
+import time
+
+WORKER_THREADS = int(os.getenv("VCEGEN_WORKER_THREADS", os.cpu_count() or 4))
+
+async def warm_up_workers(app: FastAPI):
+    loop = asyncio.get_running_loop()
+
+    try:
+        # spawn every worker thread up front, then warm the libraries inside the pool
+        await asyncio.gather(*[
+            loop.run_in_executor(app.state.executor, time.sleep, 0.01)
+            for _ in range(WORKER_THREADS)
+        ])
+        app.state.warmup_timings = await loop.run_in_executor(app.state.executor, warm_up)
+    except Exception as e:
+        # a worker pool that failed to warm up is not ready, so `/ready` keeps
+        # load balancers from routing traffic to it
+        app.state.warmup_error = f"{type(e).__name__}: {e}"
+        return
+
+    app.state.ready = True
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    background_tasks = BackgroundTasks()
-    await background_tasks()
+    app.state.executor = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="vcegen")
+    app.state.ready = False
+    app.state.warmup_timings = None
+    app.state.warmup_error = None
+
+    # warm up in the background so the server can answer health checks meanwhile;
+    # `/ready` tells load balancers when it is safe to route traffic here
+    warmup_task = asyncio.create_task(warm_up_workers(app))
+
     yield
 
+    warmup_task.cancel()
+    app.state.executor.shutdown(wait=False, cancel_futures=True)
+
 app = FastAPI(lifespan=lifespan)
 
 origins = [os.getenv("HOST_CLIENT")] if "HOST_CLIENT" in os.environ else [
@@ -30,22 +69,29 @@ app.add_middleware(
         allow_headers=["*"]
 )
 
-async def get_parser_results(parser: StandardStrategy | TripleColumnStrategy | PyMuPDFStrategy):
-    while parser.get_results() is None:
-        await asyncio.sleep(0.1)
-
-    return parser.get_results()
-
 @app.get("/")
 async def root():
     return { "message": "Hello!" }
 
 
+@app.get("/ready")
+async def ready():
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={ "ready": False, "error": app.state.warmup_error })
+
+    return {
+        "ready": True,
+        "warmup": app.state.warmup_timings
+    }
+
+
 @app.post("/analyze")
 async def analyze(file: UploadFile = File(...),
                   strategy: str = Form(...),
                   exclude_rationale: bool = Form(default=False),
                   boxed_choices: bool = Form(default=False),
+                  triage: bool = Form(default=False),
+                  normalize: bool = Form(default=False),
                   export: bool = Form(default=False)):
 
     VALID_MIMETYPES = [
@@ -55,6 +101,8 @@ async def analyze(file: UploadFile = File(...),
     if file.content_type not in VALID_MIMETYPES:
         raise HTTPException(status_code=400, detail="Invalid File Type")
 
+    parser: StandardStrategy | PyMuPDFStrategy | TripleColumnStrategy | None = None
+
     try:
         # read file
         file_data = await file.read()
@@ -65,39 +113,184 @@ async def analyze(file: UploadFile = File(...),
         # convert to a BytesIO object
         file_bytes = BytesIO(file_data)
 
-        parser: StandardStrategy | PyMuPDFStrategy | TripleColumnStrategy | None = None
-        
         if strategy == "triplecolumn":
-            parser = TripleColumnStrategy(file, exclude_rationale=exclude_rationale)
+            parser = TripleColumnStrategy(file_bytes, 
+                                          exclude_rationale=exclude_rationale,
+                                          triage=triage,
+                                          normalize=normalize)
 
         if strategy == "standard":
             parser = StandardStrategy(file_bytes, 
                                       boxed_choices=boxed_choices,
-                                      exclude_rationale=exclude_rationale)
+                                      exclude_rationale=exclude_rationale,
+                                      triage=triage,
+                                      normalize=normalize)
 
         if strategy == "pymupdf":
-            parser = PyMuPDFStrategy(file, exclude_rationale=exclude_rationale)
+            parser = PyMuPDFStrategy(file_bytes, exclude_rationale=exclude_rationale, triage=triage)
 
         if parser is None:
             raise HTTPException(status_code=500, detail="Cannot determine parser for input strategy")
 
-        parser.run()
-        results = await get_parser_results(parser)
+        results = await parser.arun(executor=app.state.executor)
         invalid: list[dict] = []
 
         if not isinstance(parser, PyMuPDFStrategy):
-            parser.validate()
+            parser.validate(print_results=False)
             invalid = parser.invalid if parser.invalid is not None else []
 
         if export:
-            parser.export()
+            # the VCE-ready TXT file of the valid questions is sent back instead of
+            # being written to the server's disk
+            return export_response(iter_export(results or [], "txt", exclude_rationale), "txt", file.filename)
 
         return { 
             "results": results,
-            "invalid": invalid
+            "invalid": invalid,
+            "skipped_pages": [asdict(page) for page in parser.skipped_pages]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="An unknown error occurred")
+    finally:
+        if parser is not None:
+            parser.close()
+
+        await file.close()
+
+
+def count_document_pages(data: bytes):
+    # runs on the parser pool, so it is serialized with the other MuPDF calls
+    document = open_document(data)
+
+    try:
+        with MUPDF_LOCK:
+            return document.page_count
+    finally:
+        with MUPDF_LOCK:
+            document.close()
+
+async def preview_strategy(name: str, data: bytes, pages: int, boxed_choices: bool, samples: int):
+    parser = create_strategy(name, BytesIO(data), boxed_choices=boxed_choices)
+    started_at = time.perf_counter()
+
+    try:
+        results = await parser.arun(1, pages, executor=app.state.executor) or []
+    except Exception as e:
+        return { "error": f"{type(e).__name__}: {e}" }
+    finally:
+        parser.close()
+
+    elapsed = time.perf_counter() - started_at
+    valid = [row for row in results if is_valid_row(row)]
+
+    return {
+        "questions": len(results),
+        "valid": len(valid),
+        "invalid": len(results) - len(valid),
+        "valid_ratio": round(len(valid) / len(results), 3) if results else 0,
+        "samples": valid[:samples] if valid else results[:samples],
+        "elapsed": round(elapsed, 3),
+        "error": None
+    }
+
+@app.post("/preview")
+async def preview(file: UploadFile = File(...),
+                  strategy: str = Form(default="all"),
+                  pages: int = Form(default=2),
+                  samples: int = Form(default=3),
+                  boxed_choices: bool = Form(default=False)):
+
+    if file.content_type != "application/pdf":
+        raise HTTPException(status_code=400, detail="Invalid File Type")
+
+    if strategy != "all" and strategy not in STRATEGIES:
+        raise HTTPException(status_code=400, detail="Cannot determine parser for input strategy")
+
+    try:
+        file_data = await file.read()
+        page_count = await run_blocking(count_document_pages, file_data, executor=app.state.executor)
+        pages = max(1, min(pages, page_count))
+        names = list(STRATEGIES) if strategy == "all" else [strategy]
+        previews = {}
+
+        for name in names:
+            previews[name] = await preview_strategy(name, file_data, pages, boxed_choices, samples)
+
+            if previews[name]["error"] is None:
+                # extrapolate from the parsed pages to the whole document
+                previews[name]["estimated_total"] = round(previews[name]["elapsed"] / pages * page_count, 3)
+
+        candidates = [name for name in names if previews[name]["error"] is None]
+        recommended = max(candidates, key=lambda name: previews[name]["valid"], default=None)
+
+        return {
+            "page_count": page_count,
+            "pages_parsed": pages,
+            "strategies": previews,
+            "recommended": recommended
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail="An unknown error occurred")
     finally:
         await file.close()
 
+
+@app.post("/export")
+async def export(file: UploadFile = File(...),
+                 strategy: str = Form(...),
+                 format: str = Form(default="txt"),
+                 gzip: bool = Form(default=False),
+                 exclude_rationale: bool = Form(default=False),
+                 boxed_choices: bool = Form(default=False),
+                 triage: bool = Form(default=False),
+                 normalize: bool = Form(default=False)):
+
+    if file.content_type != "application/pdf":
+        raise HTTPException(status_code=400, detail="Invalid File Type")
+
+    if strategy not in STRATEGIES:
+        raise HTTPException(status_code=400, detail="Cannot determine parser for input strategy")
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid export format (formats: {', '.join(EXPORT_FORMATS)})")
+
+    try:
+        file_data = await file.read()
+        parser = create_strategy(strategy,
+                                 BytesIO(file_data),
+                                 boxed_choices=boxed_choices,
+                                 exclude_rationale=exclude_rationale,
+                                 triage=triage,
+                                 normalize=normalize)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="An unknown error occurred")
+    finally:
+        await file.close()
+
+    async def iter_questions():
+        # the parser lives as long as the response, and is closed even if the
+        # client disconnects halfway through the download
+        try:
+            async for question in parser.aiter_questions(executor=app.state.executor):
+                # the same rows that `validate()` keeps, so the download matches `export()`
+                if isinstance(parser, PyMuPDFStrategy) or is_valid_row(question):
+                    yield question
+        finally:
+            parser.close()
+
+    # each question is sent as soon as it is parsed, so nothing is written to disk
+    # and the download starts after the first page
+    return export_response(aiter_export(iter_questions(), format, exclude_rationale), format, file.filename, gzip)
+
+
+def export_response(body, format: str, filename: str | None, gzip=False):
+    name = os.path.splitext(os.path.basename(filename or "export"))[0].replace('"', "")
+    headers = {
+        "Content-Disposition": f'attachment; filename="{name}.{format}"'
+    }
+
+    if gzip:
+        body = aiter_gzip(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=EXPORT_FORMATS[format], headers=headers)
@@ -1,3 +1,65 @@
-from .pymupdf import PyMuPDFStrategy
-from .standard import StandardStrategy
-from .triplecolumn import TripleColumnStrategy
+import importlib
+
+# strategy classes are imported on first access, so that importing this package
+# does not load pdfplumber, PyMuPDF and pandas before they are actually needed
+_LAZY_CLASSES = {
+    "PyMuPDFStrategy": ".pymupdf",
+    "StandardStrategy": ".standard",
+    "TripleColumnStrategy": ".triplecolumn",
+}
+
+STRATEGIES = {
+    "standard": "StandardStrategy",
+    "triplecolumn": "TripleColumnStrategy",
+    "pymupdf": "PyMuPDFStrategy",
+}
+
+__all__ = ["STRATEGIES", "create_strategy", "get_strategy_class", *_LAZY_CLASSES]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_CLASSES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_LAZY_CLASSES[name], __name__)
+    cls = getattr(module, name)
+    globals()[name] = cls
+
+    return cls
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_CLASSES])
+
+
+def get_strategy_class(name: str):
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy `{name}`. Strategies include {', '.join(f'`{s}`' for s in STRATEGIES)}")
+
+    return __getattr__(STRATEGIES[name])
+
+
+def create_strategy(name: str,
+                    input_file,
+                    boxed_choices=False,
+                    exclude_rationale=False,
+                    apply_corrections=False,
+                    triage=False,
+                    normalize=False,
+                    debug=False):
+    options = {
+        "exclude_rationale": exclude_rationale,
+        "apply_corrections": apply_corrections,
+        "triage": triage,
+        "debug": debug,
+    }
+
+    # boxed choice labels are only handled by the standard strategy
+    if name == "standard":
+        options["boxed_choices"] = boxed_choices
+
+    # PyMuPDF reads documents directly, so only the pdfplumber strategies normalize them
+    if name != "pymupdf":
+        options["normalize"] = normalize
+
+    return get_strategy_class(name)(input_file, **options)
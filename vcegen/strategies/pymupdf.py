@@ -1,8 +1,21 @@
+from __future__ import annotations
 import pymupdf
-import wordninja
-import pandas as pd
 import json
 import os
+from concurrent.futures import Executor
+from typing import Callable, TYPE_CHECKING
+from vcegen.utils.aio import iter_pages, run_blocking
+from vcegen.utils.text import correct_spacing
+from vcegen.utils.pages import normalize_page_range
+from vcegen.strategies.results import ParseResult
+from vcegen.utils.export import iter_export
+from vcegen.utils.frames import QuestionFrames, frames_from_rows
+from vcegen.utils.profiling import profile_page
+from vcegen.utils.mupdf import MUPDF_LOCK, open_document
+from vcegen.utils.triage import PageTriage, triage_document, print_triage
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class PyMuPDFStrategy:
 
@@ -10,17 +23,49 @@ class PyMuPDFStrategy:
                  input_file, 
                  exclude_rationale=False, 
                  apply_corrections=False,
+                 triage=False,
                  debug=False):
         self.input_file = input_file
-        self.document: pymupdf.Document = self.__create_document(input_file)
+        self.document: pymupdf.Document | None = self.__create_document(input_file) if input_file is not None else None
         self.exclude_rationale = exclude_rationale
         self.apply_corrections = apply_corrections
+        self.triage = triage
         self.debug = debug
         self.result: list[dict] | None = None
+        self.skipped_pages: list[PageTriage] = []
+
+
+    @classmethod
+    def configure(cls,
+                  exclude_rationale=False,
+                  apply_corrections=False,
+                  triage=False,
+                  debug=False):
+        # a configured parser holds no per-document state, so one instance can
+        # `parse()` many documents, including from several threads at once
+        return cls(None,
+                   exclude_rationale=exclude_rationale,
+                   apply_corrections=apply_corrections,
+                   triage=triage,
+                   debug=debug)
+
+
+    def close(self):
+        if self.document is not None and not self.document.is_closed:
+            with MUPDF_LOCK:
+                self.document.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *_):
+        self.close()
 
 
     def __create_document(self, input_file) -> pymupdf.Document:
-        return pymupdf.open(input_file)
+        return open_document(input_file)
 
 
     def __get_tables_from_page(self, page: pymupdf.Page):
@@ -34,7 +79,7 @@ class PyMuPDFStrategy:
         return text.replace("\n", " ")
 
 
-    def __parse_table_dataframe(self, df: pd.DataFrame, question_buf: list[dict] = []):
+    def __parse_table_dataframe(self, df: pd.DataFrame, question_buf: list[dict]):
         # actual table mappings for parsing:
         #   'QUESTION': question number (None if it corresponds to a choice/rationale row)
         #   'Col1': actual question text
@@ -60,8 +105,7 @@ class PyMuPDFStrategy:
                 question = self.__sanitize_text(question_text[idx])
 
                 if question and len(question) > 0:
-                    question = question.replace(" ", "")
-                    question = " ".join(wordninja.split(question))
+                    question = correct_spacing(question)
 
                 rows.append({
                     "question_number": q,
@@ -75,7 +119,8 @@ class PyMuPDFStrategy:
             # it must be a choice/rationale row
             #
             # example: [None, None, ..., "Strings here", "string there"]
-            if q is None:
+            # (continuation rows are skipped if the page range starts mid-question)
+            if q is None and len(rows) > 0:
                 rows[-1]["choices"].append(self.__sanitize_text(choices[idx]))
                 rows[-1]["rationale"].append(self.__sanitize_text(rationales[idx]))
 
@@ -87,12 +132,18 @@ class PyMuPDFStrategy:
         return rows
 
 
-    def __scan_page(self, page: pymupdf.Page, question_buf: list[dict] = []):
-        tables = self.__get_tables_from_page(page)
+    def __extract_tables(self, document: pymupdf.Document, page_idx: int) -> list[pd.DataFrame]:
+        # only the calls into MuPDF are serialized; the dataframes are plain Python
+        # objects, so the rest of the page is parsed without holding the lock
+        with MUPDF_LOCK:
+            return [table.to_pandas() for table in self.__get_tables_from_page(document[page_idx])]
+
 
-        for table in tables:
-            # parse the detected table into a dataframe
-            df = table.to_pandas()
+    def __scan_page(self, page_idx: int, dataframes: list[pd.DataFrame], question_buf: list[dict]):
+        # pandas is only needed once a page actually contains tables
+        import pandas as pd
+
+        for df in dataframes:
             table_keys = df.keys()
 
             if df.empty:
@@ -100,7 +151,7 @@ class PyMuPDFStrategy:
 
             input_df: pd.DataFrame | None = None
             
-            if page.number == 0:
+            if page_idx == 0:
                 if "question" not in [k.lower() for k in table_keys]:
                     continue
 
@@ -121,21 +172,60 @@ class PyMuPDFStrategy:
         return question_buf
 
 
-    def __run_strategy(self, document: pymupdf.Document):
+    def __scan_page_at(self, document: pymupdf.Document, page_idx: int, question_buf: list[dict]):
+        return self.__scan_page(page_idx, self.__extract_tables(document, page_idx), question_buf)
+
+
+    def __get_page_indices(self, document: pymupdf.Document, start_page: int | None = None, end_page: int | None = None):
+        page_indices = normalize_page_range(document.page_count, start_page, end_page)
+
+        if not self.triage:
+            return page_indices, []
+
+        # counting drawings and words is far cheaper than `find_tables()`, so pages
+        # without a question table are dropped up front
+        results = triage_document(document, page_indices)
+
+        if self.debug:
+            print_triage(results)
+
+        return [triage.page_number - 1 for triage in results if triage.keep], [triage for triage in results if not triage.keep]
+
+
+    def __collect_rows(self, document: pymupdf.Document, page_indices: list[int]):
         questions = []
         
-        for page_idx in range(document.page_count):
+        # PyMuPDF loads pages by index, so skipped pages are never touched
+        for page_idx in page_indices:
             if self.debug:
                 print(f"Scanning Page #{page_idx + 1}")
 
-            page = document[page_idx]
-            questions = self.__scan_page(page, questions)
+            with profile_page(page_idx + 1):
+                questions = self.__scan_page_at(document, page_idx, questions)
+
+        return questions
+
+
+    def __run_strategy(self, document: pymupdf.Document, start_page: int | None = None, end_page: int | None = None):
+        page_indices, self.skipped_pages = self.__get_page_indices(document, start_page, end_page)
+        self.result = self.__collect_rows(document, page_indices)
 
-        self.result = questions
 
+    def parse(self, source, start_page: int | None = None, end_page: int | None = None) -> ParseResult:
+        # everything document-specific stays local to this call
+        document = self.__create_document(source)
 
-    def run(self):
-        self.__run_strategy(self.document)
+        try:
+            page_indices, skipped_pages = self.__get_page_indices(document, start_page, end_page)
+
+            return ParseResult.from_rows(self.__collect_rows(document, page_indices), skipped_pages)
+        finally:
+            with MUPDF_LOCK:
+                document.close()
+
+
+    def run(self, start_page: int | None = None, end_page: int | None = None):
+        self.__run_strategy(self.document, start_page, end_page)
 
         if self.result is not None:
             print(f"Found {len(self.result)} questions")
@@ -143,6 +233,33 @@ class PyMuPDFStrategy:
             print("No questions found")
 
 
+    async def aiter_questions(self,
+                              start_page: int | None = None,
+                              end_page: int | None = None,
+                              on_progress: Callable[[int, int], object] | None = None,
+                              executor: Executor | None = None):
+        rows = []
+        scan_page = lambda page_idx: self.__scan_page_at(self.document, page_idx, rows)
+
+        page_indices, self.skipped_pages = await run_blocking(self.__get_page_indices, self.document, start_page, end_page, executor=executor)
+
+        async for question in iter_pages(scan_page, page_indices, rows, on_progress, executor):
+            yield question
+
+        self.result = rows
+
+
+    async def arun(self,
+                   start_page: int | None = None,
+                   end_page: int | None = None,
+                   on_progress: Callable[[int, int], object] | None = None,
+                   executor: Executor | None = None):
+        async for _ in self.aiter_questions(start_page, end_page, on_progress, executor):
+            pass
+
+        return self.result
+
+
     def get_results(self, print_results=True):
         if print_results:
             if self.result is not None:
@@ -154,8 +271,13 @@ class PyMuPDFStrategy:
         return self.result
 
 
+    def to_frame(self) -> QuestionFrames:
+        # built straight from the parsed rows; pandas is imported on first use
+        return frames_from_rows(self.result)
+
+
     def export(self, output_name=None):
-        output_file_name = "output.txt"
+        output_file_name = output_name
 
         if self.result is None or len(self.result) == 0:
             print("No questions found.")
@@ -165,28 +287,8 @@ class PyMuPDFStrategy:
             basename = os.path.basename(self.input_file)
             output_file_name = f"{os.path.splitext(basename)[0]}.txt"
 
-        file = open(f"{output_file_name}", "w")
-
-        for row in self.result:
-            file.write(f"Question NO: {row['question_number']}\n")
-            file.write(f"{row['question_text']}\n\n")
-
-            for choice in row["choices"]:
-                file.write(f"{choice}\n")
-
-            file.write(f"\nAnswer: {row['answer']}\n\n")
-
-            if not self.exclude_rationale:
-                file.write(f"Rationale:\n")
-
-                for idx, choice in enumerate(row["choices"]):
-                    if idx < len(row["rationale"]):
-                        file.write(f"{choice}: {row['rationale'][idx]}\n")
-                    else:
-                        file.write(f"{choice}: No associated rationale for choice\n")
-
-            file.write("\n")
-
-        file.close()
+        with open(output_file_name, "w") as file:
+            for chunk in iter_export(self.result, "txt", self.exclude_rationale):
+                file.write(chunk)
 
         print(f"Exported results to {output_file_name}")
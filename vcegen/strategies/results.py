@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from typing import Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from vcegen.utils.triage import PageTriage
+    from vcegen.utils.frames import QuestionFrames
+
+
+@dataclass(frozen=True)
+class Question:
+    question_number: str | None
+    question_text: str | None
+    answer: str | None
+    choices: tuple[str, ...] = ()
+    rationale: tuple[str, ...] = ()
+
+
+    @classmethod
+    def from_dict(cls, row: dict):
+        return cls(question_number=row.get("question_number"),
+                   question_text=row.get("question_text"),
+                   answer=row.get("answer"),
+                   choices=tuple(row.get("choices") or ()),
+                   rationale=tuple(row.get("rationale") or ()))
+
+
+    def to_dict(self) -> dict:
+        return {
+            "question_number": self.question_number,
+            "question_text": self.question_text,
+            "answer": self.answer,
+            "choices": list(self.choices),
+            "rationale": list(self.rationale)
+        }
+
+
+    def is_valid(self, min_choices=3):
+        return len(self.choices) >= min_choices and self.answer is not None and self.question_text is not None
+
+
+@dataclass(frozen=True)
+class ParseResult:
+    questions: tuple[Question, ...] = field(default_factory=tuple)
+    skipped_pages: tuple["PageTriage", ...] = field(default_factory=tuple)
+
+
+    @classmethod
+    def from_rows(cls, rows: list[dict], skipped_pages: list["PageTriage"] | None = None):
+        return cls(tuple(Question.from_dict(row) for row in rows), tuple(skipped_pages or ()))
+
+
+    def __len__(self):
+        return len(self.questions)
+
+
+    def __iter__(self) -> Iterator[Question]:
+        return iter(self.questions)
+
+
+    def __getitem__(self, idx: int) -> Question:
+        return self.questions[idx]
+
+
+    def to_dicts(self) -> list[dict]:
+        return [question.to_dict() for question in self.questions]
+
+
+    def to_frame(self) -> "QuestionFrames":
+        from vcegen.utils.frames import build_frames
+
+        return build_frames((q.question_number, q.question_text, q.answer, q.choices, q.rationale) for q in self.questions)
+
+
+    def valid(self, min_choices=3):
+        return ParseResult(tuple(q for q in self.questions if q.is_valid(min_choices)), self.skipped_pages)
+
+
+    def invalid(self, min_choices=3):
+        return ParseResult(tuple(q for q in self.questions if not q.is_valid(min_choices)), self.skipped_pages)
@@ -2,7 +2,23 @@ import pdfplumber
 import re
 import json
 import os
-import wordninja
+from io import BytesIO
+from concurrent.futures import Executor
+from typing import Callable
+from vcegen.utils.aio import iter_pages, run_blocking
+from vcegen.utils.text import correct_spacing
+from vcegen.utils.pages import close_pdf, get_page_range, open_pdf
+from vcegen.strategies.results import ParseResult
+from vcegen.utils.export import iter_export
+from vcegen.utils.frames import QuestionFrames, frames_from_rows
+from vcegen.utils.profiling import profile_page
+from vcegen.utils.triage import PageTriage, triage_source, print_triage
+from vcegen.utils.tuning import TuningCandidate, get_sample_pages, tune_pages
+from vcegen.utils.normalize import get_normalized_pdf, print_normalization
+
+# compiled once per process and shared (read-only) by every parser
+CHOICES_START_PATTERN = re.compile(r'\b[a-zA-Z]\.\s')
+CHOICE_SPLIT_PATTERN = re.compile(r'(?=[a-zA-Z]\.)')
 
 class TripleColumnStrategy:
 
@@ -12,22 +28,69 @@ class TripleColumnStrategy:
                  apply_corrections = False,
                  merged_rationales = False,
                  exclude_rationale = False,
-                 blacklist: list[str] = [],
+                 blacklist: list[str] | None = None,
+                 triage = False,
+                 table_settings: dict | None = None,
+                 normalize = False,
                  debug = False,
         ):
         self.input_file = input_file
         self.debug = debug
         self.result: list[dict] | None = None
         self.invalid: list[dict] | None = None
-        self.blacklist: list[str] = blacklist
+        self.skipped_pages: list[PageTriage] = []
+        self.triage = triage
+        self.table_settings = table_settings
+        self.normalize = normalize
+        self.blacklist: list[str] = blacklist if blacklist is not None else []
         self.boxed_choices = boxed_choices
         self.apply_corrections = apply_corrections
         self.merged_rationales = merged_rationales
         self.exclude_rationale = exclude_rationale
 
 
-    def set_blacklist(self, words: list[str] = []):
-        self.blacklist = words
+    @classmethod
+    def configure(cls,
+                  boxed_choices = False,
+                  apply_corrections = False,
+                  merged_rationales = False,
+                  exclude_rationale = False,
+                  blacklist: list[str] | None = None,
+                  triage = False,
+                  table_settings: dict | None = None,
+                  normalize = False,
+                  debug = False,
+        ):
+        # a configured parser holds no per-document state, so one instance can
+        # `parse()` many documents, including from several threads at once
+        return cls(None,
+                   boxed_choices=boxed_choices,
+                   apply_corrections=apply_corrections,
+                   merged_rationales=merged_rationales,
+                   exclude_rationale=exclude_rationale,
+                   blacklist=blacklist,
+                   triage=triage,
+                   table_settings=table_settings,
+                   normalize=normalize,
+                   debug=debug)
+
+
+    def set_blacklist(self, words: list[str] | None = None):
+        self.blacklist = words if words is not None else []
+
+
+    # pdfplumber documents are opened and closed within `run()`, so there is nothing
+    # to release here; these exist so every strategy can be used the same way
+    def close(self):
+        pass
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *_):
+        self.close()
 
 
     def __parse_row(self, row: list):
@@ -42,9 +105,12 @@ class TripleColumnStrategy:
 
         # check if row contains blacklisted words
         for cell in row:
-            for word in self.blacklist:
-                if type(cell) is str and word.lower() in cell.lower():
-                    return None
+            if type(cell) is str and self.blacklist:
+                cell_lower = cell.lower()
+
+                for word in self.blacklist:
+                    if word.lower() in cell_lower:
+                        return None
 
         # pre-processing
         for idx, cell in enumerate(row):
@@ -72,13 +138,13 @@ class TripleColumnStrategy:
                 entry["leftover"] = True
 
                 # check which part of the string is a question and choice
-                choices_start = re.search(r'\b[a-zA-Z]\.\s', row[0])
+                choices_start = CHOICES_START_PATTERN.search(row[0])
 
                 if choices_start:
                     entry["question_text"] = row[0][:choices_start.start()].strip()
                     choices_part = row[0][choices_start.start():].strip()
 
-                    choices = re.split(r'(?=[a-zA-Z]\.)', choices_part)
+                    choices = CHOICE_SPLIT_PATTERN.split(choices_part)
                     entry["choices"] = [choice.strip() for choice in choices if choice.strip()]
                 else:
                     entry["question_text"] = row[0]
@@ -87,8 +153,7 @@ class TripleColumnStrategy:
                     entry["answer"] = row[1]
 
                 if self.apply_corrections:
-                    entry["question_text"] = entry["question_text"].replace(" ", "")
-                    entry["question_text"] = " ".join(wordninja.split(entry["question_text"]))
+                    entry["question_text"] = correct_spacing(entry["question_text"])
 
                 for word in self.blacklist:
                     if word in entry["question_text"] or word in entry["choices"]:
@@ -101,20 +166,19 @@ class TripleColumnStrategy:
             entry["question_number"] = question_no.strip()
 
             # if row[0] contains more
-            choices_start = re.search(r'\b[a-zA-Z]\.\s', rest)
+            choices_start = CHOICES_START_PATTERN.search(rest)
 
             if choices_start:
                 entry["question_text"] = rest[:choices_start.start()].strip()
                 choices_part = rest[choices_start.start():].strip()
 
-                choices = re.split(r'(?=[a-zA-Z]\.)', choices_part)
+                choices = CHOICE_SPLIT_PATTERN.split(choices_part)
                 entry["choices"] = [choice.strip() for choice in choices if choice.strip()]
             else:
                 entry["question_text"] = rest
 
             if self.apply_corrections:
-                entry["question_text"] = entry["question_text"].replace(" ", "")
-                entry["question_text"] = " ".join(wordninja.split(entry["question_text"]))
+                entry["question_text"] = correct_spacing(entry["question_text"])
 
             if len(row) >= 2:
                 entry["answer"] = row[1]
@@ -153,54 +217,103 @@ class TripleColumnStrategy:
         return entry
 
     
-    def __run_strategy(self, pdf: pdfplumber.pdf.PDF):
-        rows = []
+    def __scan_page(self, page: pdfplumber.page.Page, rows: list[dict]):
+        return self.__scan_tables(page.extract_tables(self.table_settings), rows)
 
-        for page in pdf.pages:
-            tables = page.extract_tables()
 
-            for table in tables:
-                for row in table:
-                    output = self.__parse_row(row)
+    def __scan_tables(self, tables: list[list[list]], rows: list[dict]):
+        for table in tables:
+            for row in table:
+                output = self.__parse_row(row)
 
-                    if output is None:
-                        continue
+                if output is None:
+                    continue
 
-                    if output["leftover"] == False:
-                        del output["leftover"]
-                        rows.append(output)
-                        continue
-                    
-                    if len(rows) > 0:
-                        prev_row = rows[-1]
+                if output["leftover"] == False:
+                    del output["leftover"]
+                    rows.append(output)
+                    continue
+                
+                if len(rows) > 0:
+                    prev_row = rows[-1]
 
-                        if output["question_text"] and "question_text" in prev_row:
-                            if prev_row["question_text"] is not None:
-                                prev_row["question_text"] = " ".join([prev_row["question_text"], output["question_text"]])
-                            else:
-                                prev_row["question_text"] = output["question_text"]
+                    if output["question_text"] and "question_text" in prev_row:
+                        if prev_row["question_text"] is not None:
+                            prev_row["question_text"] = " ".join([prev_row["question_text"], output["question_text"]])
+                        else:
+                            prev_row["question_text"] = output["question_text"]
 
-                        if output["choices"] and "choices" in prev_row:
-                            prev_row["choices"] += output["choices"]
+                    if output["choices"] and "choices" in prev_row:
+                        prev_row["choices"] += output["choices"]
 
-                        if output["answer"] and "answer" in prev_row:
-                            if prev_row["answer"] is not None:
-                                prev_row["answer"] = " ".join([prev_row["answer"], output["answer"]])
-                            else:
-                                prev_row["answer"] = output["answer"]
+                    if output["answer"] and "answer" in prev_row:
+                        if prev_row["answer"] is not None:
+                            prev_row["answer"] = " ".join([prev_row["answer"], output["answer"]])
+                        else:
+                            prev_row["answer"] = output["answer"]
+
+                    rows[-1] = prev_row
+
+        return rows
+
+
+    def __normalize(self, source):
+        if not self.normalize:
+            return source
+
+        # pdfminer is slow on bloated or fragmented content streams, so it reads a
+        # cleaned-up copy of the document instead
+        normalized = get_normalized_pdf(source)
+
+        if self.debug:
+            print_normalization(normalized, source)
+
+        return normalized.source
+
+
+    def __triage(self, source, start_page: int | None = None, end_page: int | None = None) -> list[PageTriage]:
+        if not self.triage:
+            return []
+
+        results = triage_source(source, start_page, end_page, self.table_settings)
+
+        if self.debug:
+            print_triage(results)
+
+        return [triage for triage in results if not triage.keep]
+
+
+    def __get_pages(self, pdf: pdfplumber.pdf.PDF, start_page: int | None, end_page: int | None, skipped_pages: list[PageTriage]):
+        skipped = {triage.page_number for triage in skipped_pages}
+
+        return [page for page in get_page_range(pdf, start_page, end_page) if page.page_number not in skipped]
+
+
+    def __collect_rows(self, pdf: pdfplumber.pdf.PDF, start_page: int | None = None, end_page: int | None = None, skipped_pages: list[PageTriage] = ()):
+        rows = []
+
+        for page in self.__get_pages(pdf, start_page, end_page, skipped_pages):
+            with profile_page(page.page_number):
+                self.__scan_page(page, rows)
+
+        return rows
 
-                        rows[-1] = prev_row
-        
-        self.result = rows
 
+    def __run_strategy(self, pdf: pdfplumber.pdf.PDF, start_page: int | None = None, end_page: int | None = None):
+        self.result = self.__collect_rows(pdf, start_page, end_page, self.skipped_pages)
+
+
+    def validate(self, min_choices=3, auto_filter=True, print_results=True):
+        if print_results:
+            print("\nValidating...\n")
 
-    def validate(self, min_choices=3, auto_filter=True):
-        print("\nValidating...\n")
         invalid = []
         original_count = len(self.result) if self.result is not None else 0
 
         if self.result is None:
-            print("No results attached to instance")
+            if print_results:
+                print("No results attached to instance")
+
             return
 
         for row in self.result:
@@ -219,6 +332,11 @@ class TripleColumnStrategy:
             for entry in invalid:
                 self.result.remove(entry)
         
+        self.invalid = invalid
+
+        if not print_results:
+            return
+
         print(f"Found {original_count} rows.")
         print(f"Invalid Rows: {len(invalid)}/{original_count}")
         print(f"Total Valid Rows: {len(self.result)}/{original_count}")
@@ -228,12 +346,80 @@ class TripleColumnStrategy:
             for entry in invalid:
                 print(json.dumps(entry, indent=2))
 
-        self.invalid = invalid
 
+    def parse(self, source: str | BytesIO | bytes, start_page: int | None = None, end_page: int | None = None) -> ParseResult:
+        # everything document-specific stays local to this call; file-like sources
+        # must not be shared between concurrent calls
+        if isinstance(source, (bytes, bytearray)):
+            source = BytesIO(source)
+
+        source = self.__normalize(source)
+        skipped_pages = self.__triage(source, start_page, end_page)
 
-    def run(self):
-        with pdfplumber.open(self.input_file) as pdf:
-            self.__run_strategy(pdf)
+        with open_pdf(source) as pdf:
+            return ParseResult.from_rows(self.__collect_rows(pdf, start_page, end_page, skipped_pages), skipped_pages)
+
+
+    def tune(self,
+             sample_pages: int = 3,
+             candidates: list[dict] | None = None,
+             min_choices: int = 3,
+             apply: bool = True,
+             start_page: int | None = None,
+             end_page: int | None = None) -> list[TuningCandidate]:
+        source = self.__normalize(self.input_file)
+        skipped_pages = self.__triage(source, start_page, end_page)
+
+        with open_pdf(source) as pdf:
+            pages = get_sample_pages(pdf, sample_pages, start_page, end_page, [triage.page_number for triage in skipped_pages])
+            results = tune_pages(pages, self.__scan_tables, candidates, min_choices, self.debug)
+
+        # settings that find no valid questions on the sample are not worth keeping
+        if apply and len(results) > 0 and results[0].valid > 0:
+            self.table_settings = results[0].settings
+
+        return results
+
+
+    def run(self, start_page: int | None = None, end_page: int | None = None):
+        source = self.__normalize(self.input_file)
+        self.skipped_pages = self.__triage(source, start_page, end_page)
+
+        with open_pdf(source) as pdf:
+            self.__run_strategy(pdf, start_page, end_page)
+
+
+    async def aiter_questions(self,
+                              start_page: int | None = None,
+                              end_page: int | None = None,
+                              on_progress: Callable[[int, int], object] | None = None,
+                              executor: Executor | None = None):
+        source = await run_blocking(self.__normalize, self.input_file, executor=executor)
+        self.skipped_pages = await run_blocking(self.__triage, source, start_page, end_page, executor=executor)
+        pdf = await run_blocking(pdfplumber.open, source, executor=executor)
+        rows = []
+
+        try:
+            pages = await run_blocking(self.__get_pages, pdf, start_page, end_page, self.skipped_pages, executor=executor)
+            scan_page = lambda page_idx: self.__scan_page(pages[page_idx], rows)
+
+            async for question in iter_pages(scan_page, range(len(pages)), rows, on_progress, executor):
+                yield question
+        finally:
+            close_pdf(pdf)
+
+        self.result = rows
+
+
+    async def arun(self,
+                   start_page: int | None = None,
+                   end_page: int | None = None,
+                   on_progress: Callable[[int, int], object] | None = None,
+                   executor: Executor | None = None):
+        async for _ in self.aiter_questions(start_page, end_page, on_progress, executor):
+            pass
+
+        return self.result
 
     
     def get_results(self, print_results=True):
@@ -247,8 +433,13 @@ class TripleColumnStrategy:
         return self.result
 
 
+    def to_frame(self) -> QuestionFrames:
+        # built straight from the parsed rows; pandas is imported on first use
+        return frames_from_rows(self.result)
+
+
     def export(self, output_name=None):
-        output_file_name = "output.txt"
+        output_file_name = output_name
 
         if self.result is None or len(self.result) == 0:
             print("No questions found.")
@@ -258,29 +449,9 @@ class TripleColumnStrategy:
             basename = os.path.basename(self.input_file)
             output_file_name = f"{os.path.splitext(basename)[0]}.txt"
 
-        file = open(f"{output_file_name}", "w")
-
-        for row in self.result:
-            file.write(f"Question NO: {row['question_number']}\n")
-            file.write(f"{row['question_text']}\n\n")
-
-            for choice in row["choices"]:
-                file.write(f"{choice}\n")
-
-            file.write(f"\nAnswer: {row['answer']}\n\n")
-
-            if not self.exclude_rationale:
-                file.write(f"Rationale:\n")
-
-                for idx, choice in enumerate(row["choices"]):
-                    if idx < len(row["rationale"]):
-                        file.write(f"{choice}: {row['rationale'][idx]}\n")
-                    else:
-                        file.write(f"{choice}: No associated rationale for choice\n")
-
-            file.write("\n")
-
-        file.close()
+        with open(output_file_name, "w") as file:
+            for chunk in iter_export(self.result, "txt", self.exclude_rationale):
+                file.write(chunk)
 
         print(f"Exported results to {output_file_name}")
 
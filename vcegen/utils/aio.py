@@ -0,0 +1,49 @@
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from typing import AsyncIterator, Callable, Iterable
+
+
+async def run_blocking(func: Callable, *args, executor: Executor | None = None):
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor, func, *args)
+
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # the worker thread cannot be interrupted, so let it finish before the
+        # caller gets a chance to close the document it is reading from
+        await asyncio.wait([future])
+        raise
+
+
+async def iter_pages(scan_page: Callable[[int], None],
+                     page_indices: Iterable[int],
+                     rows: list[dict],
+                     on_progress: Callable[[int, int], object] | None = None,
+                     executor: Executor | None = None) -> AsyncIterator[dict]:
+    page_indices = list(page_indices)
+    total = len(page_indices)
+    emitted = 0
+
+    for done, page_idx in enumerate(page_indices, start=1):
+        await run_blocking(scan_page, page_idx, executor=executor)
+
+        # the last row may still receive continuation rows from the next page,
+        # so only rows before it are final
+        while emitted < len(rows) - 1:
+            yield rows[emitted]
+            emitted += 1
+
+        if on_progress is not None:
+            outcome = on_progress(done, total)
+
+            if inspect.isawaitable(outcome):
+                await outcome
+
+        # give other tasks a chance to run between pages
+        await asyncio.sleep(0)
+
+    while emitted < len(rows):
+        yield rows[emitted]
+        emitted += 1
@@ -0,0 +1,5 @@
+import os
+
+
+def get_cache_dir():
+    return os.getenv("VCEGEN_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "vcegen"))
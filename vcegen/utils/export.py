@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Iterable, Iterator
+
+EXPORT_FORMATS = {
+    "txt": "text/plain; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+CSV_COLUMNS = ["question_number", "question_text", "answer", "choices", "rationale"]
+
+GZIP_FLUSH_SIZE = 16 * 1024
+
+
+def render_vce_question(row: dict, exclude_rationale=False) -> str:
+    # the VCE-ready format read by Exam Formatter
+    lines = [f"Question NO: {row['question_number']}\n", f"{row['question_text']}\n\n"]
+
+    for choice in row["choices"]:
+        lines.append(f"{choice}\n")
+
+    lines.append(f"\nAnswer: {row['answer']}\n\n")
+
+    if not exclude_rationale:
+        lines.append(f"Rationale:\n")
+
+        for idx, choice in enumerate(row["choices"]):
+            if idx < len(row["rationale"]):
+                lines.append(f"{choice}: {row['rationale'][idx]}\n")
+            else:
+                lines.append(f"{choice}: No associated rationale for choice\n")
+
+    lines.append("\n")
+
+    return "".join(lines)
+
+
+def render_jsonl_question(row: dict) -> str:
+    return json.dumps(row) + "\n"
+
+
+def render_csv_header() -> str:
+    return render_csv_row(CSV_COLUMNS)
+
+
+def render_csv_question(row: dict) -> str:
+    # choices and rationale entries are kept in one cell each, one entry per line
+    return render_csv_row([row["question_number"],
+                           row["question_text"],
+                           row["answer"],
+                           "\n".join(str(choice) for choice in row["choices"]),
+                           "\n".join(str(rationale) for rationale in row["rationale"])])
+
+
+def render_csv_row(values: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+def render_question(row: dict, format: str = "txt", exclude_rationale=False) -> str:
+    if format == "txt":
+        return render_vce_question(row, exclude_rationale)
+
+    if format == "jsonl":
+        return render_jsonl_question(row)
+
+    if format == "csv":
+        return render_csv_question(row)
+
+    raise ValueError(f"Unknown export format `{format}`. Formats include {', '.join(f'`{f}`' for f in EXPORT_FORMATS)}")
+
+
+def iter_export(rows: Iterable[dict], format: str = "txt", exclude_rationale=False) -> Iterator[str]:
+    if format == "csv":
+        yield render_csv_header()
+
+    for row in rows:
+        yield render_question(row, format, exclude_rationale)
+
+
+async def aiter_export(rows: AsyncIterator[dict], format: str = "txt", exclude_rationale=False) -> AsyncIterator[bytes]:
+    if format == "csv":
+        yield render_csv_header().encode()
+
+    async for row in rows:
+        yield render_question(row, format, exclude_rationale).encode()
+
+
+async def aiter_gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # wbits=31 writes a gzip header, so the stream can be served with
+    # `Content-Encoding: gzip`
+    compressor = zlib.compressobj(wbits=31)
+    pending = 0
+    first = True
+
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        pending += len(chunk)
+
+        # zlib holds on to its input until a block is full, which can be the whole
+        # export; flushing after the first chunk and then every GZIP_FLUSH_SIZE bytes
+        # lets the download start right away at a small cost in compression
+        if first or pending >= GZIP_FLUSH_SIZE:
+            compressed += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+            first = False
+
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
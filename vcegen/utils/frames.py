@@ -0,0 +1,117 @@
+from __future__ import annotations
+import importlib.util
+import os
+from dataclasses import dataclass
+from typing import Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FRAME_FORMATS = ["parquet", "feather"]
+
+
+@dataclass(frozen=True)
+class QuestionFrames:
+    # `question_id` is the position of the question in the results, and is the key
+    # that `choices` and `rationales` refer to
+    questions: pd.DataFrame
+    choices: pd.DataFrame
+    rationales: pd.DataFrame
+
+
+    def to_parquet(self, directory: str):
+        return write_frames(self, directory, "parquet")
+
+
+    def to_feather(self, directory: str):
+        return write_frames(self, directory, "feather")
+
+
+def build_frames(rows: Iterable[tuple]) -> QuestionFrames:
+    # pandas is only needed by callers that ask for frames
+    import pandas as pd
+
+    # Arrow-backed strings are far more compact than Python string objects
+    string_dtype = "string[pyarrow]" if importlib.util.find_spec("pyarrow") is not None else "string"
+
+    # each column is collected into a flat list in a single pass over the rows, so
+    # no per-question objects are created along the way
+    question_ids = []
+    question_numbers = []
+    question_texts = []
+    answers = []
+
+    choice_question_ids = []
+    choice_positions = []
+    choice_texts = []
+
+    rationale_question_ids = []
+    rationale_positions = []
+    rationale_texts = []
+
+    for question_id, (question_number, question_text, answer, choices, rationale) in enumerate(rows):
+        question_ids.append(question_id)
+        question_numbers.append(question_number)
+        question_texts.append(question_text)
+        answers.append(answer)
+
+        for position, choice in enumerate(choices):
+            choice_question_ids.append(question_id)
+            choice_positions.append(position)
+            choice_texts.append(choice)
+
+        for position, entry in enumerate(rationale):
+            rationale_question_ids.append(question_id)
+            rationale_positions.append(position)
+            rationale_texts.append(entry)
+
+    # question numbers are kept as parsed, since they are not always numeric
+    questions = pd.DataFrame({
+        "question_id": pd.array(question_ids, dtype="int32"),
+        "question_number": pd.array(question_numbers, dtype=string_dtype),
+        "question_text": pd.array(question_texts, dtype=string_dtype),
+        "answer": pd.Categorical(answers),
+    })
+
+    choices = pd.DataFrame({
+        "question_id": pd.array(choice_question_ids, dtype="int32"),
+        "position": pd.array(choice_positions, dtype="int16"),
+        "choice": pd.array(choice_texts, dtype=string_dtype),
+    })
+
+    rationales = pd.DataFrame({
+        "question_id": pd.array(rationale_question_ids, dtype="int32"),
+        "position": pd.array(rationale_positions, dtype="int16"),
+        "rationale": pd.array(rationale_texts, dtype=string_dtype),
+    })
+
+    return QuestionFrames(questions, choices, rationales)
+
+
+def frames_from_rows(rows: Iterable[dict] | None) -> QuestionFrames:
+    return build_frames((row["question_number"], row["question_text"], row["answer"], row["choices"], row["rationale"])
+                        for row in rows or ())
+
+
+def write_frames(frames: QuestionFrames, directory: str, format: str = "parquet") -> list[str]:
+    if format not in FRAME_FORMATS:
+        raise ValueError(f"Unknown frame format `{format}`. Formats include {', '.join(f'`{f}`' for f in FRAME_FORMATS)}")
+
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ModuleNotFoundError("pyarrow is required to write Parquet and Feather files (pip install pyarrow)")
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+
+    for name in ["questions", "choices", "rationales"]:
+        path = os.path.join(directory, f"{name}.{format}")
+        frame = getattr(frames, name)
+
+        if format == "parquet":
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_feather(path)
+
+        paths.append(path)
+
+    return paths
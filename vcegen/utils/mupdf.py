@@ -0,0 +1,22 @@
+import threading
+
+# MuPDF is not thread-safe, so calls into it are serialized across all parsers
+MUPDF_LOCK = threading.Lock()
+
+
+def open_document(source=None):
+    import pymupdf
+
+    # file-like objects (e.g. BytesIO, uploaded files) have to be passed as a stream
+    if hasattr(source, "read"):
+        source = source.read()
+
+    with MUPDF_LOCK:
+        # without a source, a new empty document is created
+        if source is None:
+            return pymupdf.open()
+
+        if isinstance(source, (bytes, bytearray)):
+            return pymupdf.open(stream=source, filetype="pdf")
+
+        return pymupdf.open(source)
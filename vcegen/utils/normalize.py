@@ -0,0 +1,171 @@
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from io import BytesIO
+from vcegen.utils.cache import get_cache_dir
+from vcegen.utils.mupdf import MUPDF_LOCK, open_document
+from vcegen.utils.pages import get_page_range, open_pdf, preload_page
+
+# garbage=4 drops unused objects and merges duplicated ones, clean=True rewrites
+# every page into a single sanitized content stream, and deflate=True compresses
+# the streams that were stored uncompressed
+SAVE_OPTIONS = {
+    "garbage": 4,
+    "clean": True,
+    "deflate": True,
+}
+
+# once the cache grows past this size, the least recently used copies are removed
+MAX_CACHE_SIZE = int(os.getenv("VCEGEN_NORMALIZED_CACHE_SIZE", 1024 * 1024 * 1024))
+
+
+@dataclass(frozen=True)
+class NormalizedPdf:
+    # `path` is None for documents normalized in memory, which keep `data` instead
+    path: str | None
+    original_size: int
+    normalized_size: int
+    elapsed: float
+    cached: bool
+    data: bytes | None = field(default=None, repr=False)
+
+
+    @property
+    def source(self):
+        return self.path if self.path is not None else BytesIO(self.data)
+
+
+def read_source(source) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+
+    # leave file-like sources where they were, so they can still be read afterwards
+    if hasattr(source, "read"):
+        position = source.tell()
+        data = source.read()
+        source.seek(position)
+        return data
+
+    with open(source, "rb") as file:
+        return file.read()
+
+
+def normalize_pdf(data: bytes) -> bytes:
+    document = open_document(data)
+
+    try:
+        with MUPDF_LOCK:
+            return document.tobytes(**SAVE_OPTIONS)
+    finally:
+        with MUPDF_LOCK:
+            document.close()
+
+
+def list_cache_entries(directory: str) -> list[tuple[float, int, str]]:
+    entries = []
+
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(".pdf"):
+            continue
+
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    return entries
+
+
+def evict_cache(directory: str, max_size: int = MAX_CACHE_SIZE, keep: str | None = None):
+    entries = sorted(list_cache_entries(directory))
+    total = sum(size for _, size, _ in entries)
+
+    # the modification time is bumped on every cache hit, so the oldest entries
+    # are the least recently used ones
+    for _, size, path in entries:
+        if total <= max_size:
+            break
+
+        if path == keep:
+            continue
+
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # another worker evicted it first
+            pass
+
+        total -= size
+
+
+def normalize_in_memory(source) -> NormalizedPdf:
+    started_at = time.perf_counter()
+    data = read_source(source)
+    normalized = normalize_pdf(data)
+
+    return NormalizedPdf(None, len(data), len(normalized), time.perf_counter() - started_at, False, normalized)
+
+
+def get_normalized_pdf(source, cache_dir: str | None = None, max_cache_size: int = MAX_CACHE_SIZE) -> NormalizedPdf:
+    # only documents that already are files are cached; in-memory documents (e.g.
+    # uploads to the REST API) are never written to disk
+    if not isinstance(source, (str, os.PathLike)):
+        return normalize_in_memory(source)
+
+    started_at = time.perf_counter()
+    data = read_source(source)
+
+    # the cache is keyed by content, so renamed or copied documents are only
+    # normalized once
+    digest = hashlib.sha256(data).hexdigest()
+    directory = cache_dir or os.path.join(get_cache_dir(), "normalized")
+    path = os.path.join(directory, f"{digest}.pdf")
+
+    if os.path.exists(path):
+        try:
+            os.utime(path)
+            return NormalizedPdf(path, len(data), os.path.getsize(path), time.perf_counter() - started_at, True)
+        except FileNotFoundError:
+            # evicted by another worker in the meantime
+            pass
+
+    normalized = normalize_pdf(data)
+
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, "wb") as file:
+        file.write(normalized)
+
+    # several workers may normalize the same document at the same time; the last
+    # rename wins and every reader sees a complete file
+    os.replace(tmp_path, path)
+    evict_cache(directory, max_cache_size, keep=path)
+
+    return NormalizedPdf(path, len(data), len(normalized), time.perf_counter() - started_at, False)
+
+
+def time_page_loading(source, page_count: int = 1):
+    if isinstance(source, (bytes, bytearray)) or hasattr(source, "read"):
+        source = BytesIO(read_source(source))
+
+    started_at = time.perf_counter()
+
+    with open_pdf(source) as pdf:
+        for page in get_page_range(pdf, 1, page_count):
+            preload_page(page)
+
+    return time.perf_counter() - started_at
+
+
+def print_normalization(result: NormalizedPdf, original_source, page_count: int = 1):
+    print(f"Normalized PDF ({result.original_size / 1024:.0f} KB -> {result.normalized_size / 1024:.0f} KB) "
+          f"in {result.elapsed:.2f}s{' (cached)' if result.cached else ''}: {result.path or 'in memory'}")
+
+    original = time_page_loading(original_source, page_count)
+    normalized = time_page_loading(result.source, page_count)
+
+    print(f"Loading the first {page_count} page(s): {original:.2f}s original, {normalized:.2f}s normalized")
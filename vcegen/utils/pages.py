@@ -0,0 +1,147 @@
+import itertools
+from contextlib import contextmanager
+
+# pdfminer is imported inside the functions that need it, so that PyMuPDFStrategy
+# can use `normalize_page_range()` without loading it
+
+
+def normalize_page_range(page_count: int, start_page: int | None = None, end_page: int | None = None):
+    # page numbers are 1-based and inclusive; a range that is inverted or starts
+    # past the last page selects no pages
+    start = max(start_page or 1, 1)
+    end = min(end_page or page_count, page_count)
+
+    if end < start:
+        return range(0)
+
+    return range(start - 1, end)
+
+
+def count_pages(pdf) -> int:
+    from pdfminer.pdftypes import dict_value, resolve1
+
+    try:
+        return int(resolve1(dict_value(pdf.doc.catalog["Pages"])["Count"]))
+    except Exception:
+        return len(pdf.pages)
+
+
+def _find_page(pdf, page_idx: int):
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdftypes import dict_value, list_value, resolve1
+    from pdfminer.psparser import LIT
+
+    # walk down the page tree using each node's /Count instead of enumerating
+    # every page before the one we need
+    node_ref = pdf.doc.catalog["Pages"]
+    inherited = {}
+    visited = set()
+
+    while True:
+        node = dict_value(node_ref)
+
+        if id(node) in visited:
+            raise ValueError("Cycle in page tree")
+
+        visited.add(id(node))
+        inherited.update({k: v for k, v in node.items() if k in PDFPage.INHERITABLE_ATTRS})
+        next_ref = None
+
+        for kid_ref in list_value(node["Kids"]):
+            kid = dict_value(kid_ref)
+
+            if kid.get("Type") is LIT("Pages") or "Kids" in kid:
+                count = int(resolve1(kid["Count"]))
+
+                if page_idx < count:
+                    next_ref = kid_ref
+                    break
+
+                page_idx -= count
+            elif kid.get("Type") is LIT("Page") or kid.get("Type") is None:
+                if page_idx == 0:
+                    attrs = {**inherited, **kid}
+                    return PDFPage(pdf.doc, getattr(kid_ref, "objid", None), attrs, None)
+
+                page_idx -= 1
+
+        if next_ref is None:
+            raise IndexError("Page index out of range")
+
+        node_ref = next_ref
+
+
+def get_pages(pdf, page_indices) -> list:
+    from pdfminer.pdfpage import PDFPage
+    from pdfplumber.page import Page
+
+    page_indices = list(page_indices)
+
+    try:
+        page_objects = [_find_page(pdf, page_idx) for page_idx in page_indices]
+    except Exception:
+        # malformed page trees fall back to pdfminer's sequential walk, which
+        # still stops as soon as the last requested page has been reached
+        walked = list(itertools.islice(PDFPage.create_pages(pdf.doc), max(page_indices, default=-1) + 1))
+        page_indices = [page_idx for page_idx in page_indices if page_idx < len(walked)]
+        page_objects = [walked[page_idx] for page_idx in page_indices]
+
+    pages = []
+    doctop = 0
+
+    for page_idx, page_object in zip(page_indices, page_objects):
+        page = Page(pdf, page_object, page_number=page_idx + 1, initial_doctop=doctop)
+        pages.append(page)
+        doctop += page.height
+
+    # remembered so that `close_pdf()` can close them
+    if not hasattr(pdf, "_range_pages"):
+        pdf._range_pages = []
+
+    pdf._range_pages.extend(pages)
+
+    return pages
+
+
+def get_page_range(pdf, start_page: int | None = None, end_page: int | None = None) -> list:
+    if start_page is None and end_page is None:
+        return pdf.pages
+
+    page_count = count_pages(pdf)
+    page_indices = normalize_page_range(page_count, start_page, end_page)
+
+    if len(page_indices) == page_count:
+        return pdf.pages
+
+    return get_pages(pdf, page_indices)
+
+
+def preload_page(page):
+    # pdfminer lays out a page the first time its objects are accessed
+    return page.edges
+
+
+def close_pdf(pdf):
+    # does what `PDF.close()` does, except that `PDF.close()` goes through
+    # `pdf.pages`, which creates every page of the document when only a range was
+    # read; only the pages that were actually created are closed here
+    for page in [*getattr(pdf, "_pages", []), *getattr(pdf, "_range_pages", [])]:
+        page.close()
+
+    pdf._range_pages = []
+    pdf.flush_cache()
+
+    if not pdf.stream_is_external:
+        pdf.stream.close()
+
+
+@contextmanager
+def open_pdf(source):
+    import pdfplumber
+
+    pdf = pdfplumber.open(source)
+
+    try:
+        yield pdf
+    finally:
+        close_pdf(pdf)
@@ -0,0 +1,241 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from types import CodeType
+
+STAGES = ["imports", "layout", "tables", "dataframes", "rows", "corrections", "other"]
+
+# a sample is attributed to the stage of its innermost frame that matches one of
+# these paths, so e.g. wordninja called from `__parse_row` counts as corrections
+STAGE_PATHS = [
+    ("corrections", ["wordninja", os.path.join("vcegen", "utils", "wordcost.py"), os.path.join("vcegen", "utils", "text.py")]),
+    ("tables", [os.path.join("pdfplumber", "table.py"), os.path.join("pymupdf", "table.py")]),
+    ("layout", [f"{os.sep}pdfminer{os.sep}", f"{os.sep}pdfplumber{os.sep}", f"{os.sep}pymupdf{os.sep}"]),
+    ("dataframes", [f"{os.sep}pandas{os.sep}", f"{os.sep}numpy{os.sep}"]),
+    ("rows", [os.path.join("vcegen", "strategies")]),
+]
+
+IMPORTLIB_FILENAME = "<frozen importlib._bootstrap>"
+
+# the interpreter only switches threads every few milliseconds (see
+# `sys.getswitchinterval()`), so sampling faster than that gains nothing
+DEFAULT_INTERVAL = 0.005
+
+_active_profiler = None
+
+
+def classify_code(code: CodeType) -> str | None:
+    for stage, paths in STAGE_PATHS:
+        for path in paths:
+            if path in code.co_filename:
+                return stage
+
+    return None
+
+
+def format_code(code: CodeType) -> str:
+    # semicolons separate frames in the collapsed-stack format
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+@contextmanager
+def profile_page(page_number: int):
+    # strategies wrap each page in this; it costs nothing unless a profiler is running
+    profiler = _active_profiler
+
+    if profiler is None or threading.get_ident() != profiler.thread_id:
+        yield
+        return
+
+    with profiler.page(page_number):
+        yield
+
+
+class Profiler:
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.thread_id: int | None = None
+        self.elapsed = 0.0
+        self.stacks: Counter[tuple[CodeType, ...]] = Counter()
+        self.page_times: dict[int, float] = defaultdict(float)
+        self.page_samples: dict[int | None, Counter[str]] = defaultdict(Counter)
+        self.__stages: dict[CodeType, str | None] = {}
+        self.__current_page: int | None = None
+        self.__stopped = threading.Event()
+        self.__sampler: threading.Thread | None = None
+        self.__started_at = 0.0
+
+
+    def start(self):
+        global _active_profiler
+
+        if _active_profiler is not None:
+            raise RuntimeError("Another profiler is already running")
+
+        # only the thread that starts the profiler is sampled
+        self.thread_id = threading.get_ident()
+        self.__started_at = time.perf_counter()
+        self.__stopped.clear()
+        self.__sampler = threading.Thread(target=self.__sample, name="vcegen-profiler", daemon=True)
+        self.__sampler.start()
+        _active_profiler = self
+
+
+    def stop(self):
+        global _active_profiler
+
+        if _active_profiler is self:
+            _active_profiler = None
+
+        self.__stopped.set()
+
+        if self.__sampler is not None:
+            self.__sampler.join()
+            self.__sampler = None
+
+        self.elapsed += time.perf_counter() - self.__started_at
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, *_):
+        self.stop()
+
+
+    @contextmanager
+    def page(self, page_number: int):
+        self.__current_page = page_number
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.page_times[page_number] += time.perf_counter() - started_at
+            self.__current_page = None
+
+
+    def __sample(self):
+        while not self.__stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+
+            if len(stack) == 0:
+                continue
+
+            self.stacks[tuple(reversed(stack))] += 1
+            self.page_samples[self.__current_page][self.__classify(stack)] += 1
+
+
+    def __classify(self, stack: list[CodeType]) -> str:
+        # pandas and wordninja are imported on first use, which would otherwise be
+        # counted towards the first page that needs them
+        if any(code.co_filename == IMPORTLIB_FILENAME for code in stack):
+            return "imports"
+
+        # innermost frame first
+        for code in stack:
+            if code not in self.__stages:
+                self.__stages[code] = classify_code(code)
+
+            stage = self.__stages[code]
+
+            if stage is not None:
+                return stage
+
+        return "other"
+
+
+    @property
+    def sample_count(self):
+        return sum(self.stacks.values())
+
+
+    def get_page_stages(self, page_number: int) -> dict[str, float]:
+        # samples give the proportions, the page timer gives the actual wall time
+        samples = self.page_samples.get(page_number, Counter())
+        total = sum(samples.values())
+        wall = self.page_times.get(page_number, 0.0)
+
+        if total == 0:
+            return {stage: wall if stage == "other" else 0.0 for stage in STAGES}
+
+        return {stage: wall * samples[stage] / total for stage in STAGES}
+
+
+    def get_stage_totals(self) -> dict[str, float]:
+        totals = dict.fromkeys(STAGES, 0.0)
+
+        for page_number in self.page_times:
+            for stage, seconds in self.get_page_stages(page_number).items():
+                totals[stage] += seconds
+
+        return totals
+
+
+    def get_functions(self) -> list[tuple[CodeType, int, int]]:
+        own = Counter()
+        cumulative = Counter()
+
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+
+            # recursive functions are only counted once per sample
+            for code in set(stack):
+                cumulative[code] += count
+
+        return sorted(((code, own[code], cumulative[code]) for code in cumulative), key=lambda item: (-item[1], -item[2]))
+
+
+    def report(self, top: int = 10) -> str:
+        samples = self.sample_count
+        lines = [f"Profiled {len(self.page_times)} page(s) in {self.elapsed:.2f}s "
+                 f"({samples} samples, every {self.interval * 1000:.0f}ms)", ""]
+
+        lines.append("Slowest pages:")
+        lines.append(f"  {'page':>6} {'wall':>8} " + " ".join(f"{stage:>11}" for stage in STAGES))
+
+        for page_number in sorted(self.page_times, key=self.page_times.get, reverse=True)[:top]:
+            stages = self.get_page_stages(page_number)
+            lines.append(f"  {page_number:>6} {self.page_times[page_number]:>7.3f}s " + " ".join(f"{stages[stage]:>10.3f}s" for stage in STAGES))
+
+        lines.append("")
+        lines.append("Time by stage:")
+        totals = self.get_stage_totals()
+        pages_total = sum(totals.values())
+
+        for stage in STAGES:
+            share = totals[stage] / pages_total if pages_total > 0 else 0
+            lines.append(f"  {stage:<12} {totals[stage]:>8.3f}s {share:>6.1%}")
+
+        lines.append("")
+        lines.append("Slowest functions (sampled):")
+        lines.append(f"  {'self':>6} {'total':>6}  function")
+
+        for code, own, cumulative in self.get_functions()[:top]:
+            lines.append(f"  {own / samples if samples else 0:>6.1%} {cumulative / samples if samples else 0:>6.1%}  {format_code(code)}")
+
+        return "\n".join(lines) + "\n"
+
+
+    def write_report(self, path: str, top: int = 10):
+        with open(path, "w") as file:
+            file.write(self.report(top))
+
+
+    def write_collapsed(self, path: str):
+        # one `frame;frame;...;leaf count` line per distinct stack, as read by
+        # flamegraph.pl, speedscope and inferno
+        with open(path, "w") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{';'.join(format_code(code) for code in stack)} {count}\n")
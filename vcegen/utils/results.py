@@ -0,0 +1,15 @@
+def is_valid_row(row: dict, min_choices=3):
+    if len(row["choices"]) < min_choices:
+        return False
+
+    if row["answer"] is None or row["question_text"] is None:
+        return False
+
+    return True
+
+
+def count_valid_rows(rows: list[dict] | None, min_choices=3):
+    if rows is None:
+        return 0
+
+    return sum(1 for row in rows if is_valid_row(row, min_choices))
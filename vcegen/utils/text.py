@@ -1,5 +1,56 @@
+import os
+import threading
+
+CORRECTION_BACKENDS = ["wordninja", "shared"]
+
+_correction_backend = os.getenv("VCEGEN_CORRECTION_BACKEND", "wordninja")
+_shared_model = None
+_shared_model_lock = threading.Lock()
+
+
 def sanitize_text(text):
     if type(text) is not str:
         return text
 
     return text.replace("\n", " ")
+
+
+def set_correction_backend(backend: str):
+    global _correction_backend
+
+    if backend not in CORRECTION_BACKENDS:
+        raise ValueError(f"Unknown correction backend `{backend}`. Backends include {', '.join(f'`{b}`' for b in CORRECTION_BACKENDS)}")
+
+    _correction_backend = backend
+
+
+def get_correction_backend():
+    return _correction_backend
+
+
+def get_shared_model():
+    global _shared_model
+
+    # the table is memory-mapped, so all processes on a machine share one copy
+    if _shared_model is None:
+        with _shared_model_lock:
+            if _shared_model is None:
+                from vcegen.utils.wordcost import SharedLanguageModel
+                _shared_model = SharedLanguageModel.load(os.getenv("VCEGEN_WORDCOST_TABLE"))
+
+    return _shared_model
+
+
+def split_words(text: str) -> list[str]:
+    if _correction_backend == "shared":
+        return get_shared_model().split(text)
+
+    # wordninja builds its language model on import, so it is only loaded
+    # once a strategy actually applies corrections
+    import wordninja
+
+    return wordninja.split(text)
+
+
+def correct_spacing(text: str) -> str:
+    return " ".join(split_words(text.replace(" ", "")))
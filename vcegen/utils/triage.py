@@ -0,0 +1,152 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable
+from vcegen.utils.mupdf import MUPDF_LOCK, open_document
+from vcegen.utils.pages import normalize_page_range
+
+QUESTION_NUMBER_PATTERN = re.compile(r"^\d{1,4}[.)]?$")
+
+# a table needs at least a couple of ruling lines in each direction; both the
+# pdfplumber and PyMuPDF table finders rely on these lines
+MIN_HORIZONTAL_LINES = 2
+MIN_VERTICAL_LINES = 2
+
+# drawings thinner than this are treated as ruling lines
+LINE_THICKNESS = 2
+
+# pdfplumber strategies that find table cells from ruling lines
+LINE_STRATEGIES = ["lines", "lines_strict"]
+
+
+@dataclass(frozen=True)
+class PageTriage:
+    page_number: int
+    keep: bool
+    reason: str
+    horizontal_lines: int
+    vertical_lines: int
+    words: int
+    question_numbers: int
+
+
+def count_ruling_lines(page) -> tuple[int, int]:
+    horizontal = 0
+    vertical = 0
+
+    for path in page.get_drawings():
+        for item in path["items"]:
+            if item[0] == "l":
+                start, end = item[1], item[2]
+
+                if abs(start.y - end.y) < LINE_THICKNESS:
+                    horizontal += 1
+                elif abs(start.x - end.x) < LINE_THICKNESS:
+                    vertical += 1
+            elif item[0] == "re":
+                rect = item[1]
+
+                if rect.height < LINE_THICKNESS and rect.width > LINE_THICKNESS:
+                    horizontal += 1
+                elif rect.width < LINE_THICKNESS and rect.height > LINE_THICKNESS:
+                    vertical += 1
+                else:
+                    # cell borders are often drawn as rectangles
+                    horizontal += 2
+                    vertical += 2
+
+    return horizontal, vertical
+
+
+def get_required_lines(table_settings: dict | None = None) -> tuple[int, int]:
+    # the "text" strategies find tables from the alignment of words, so a
+    # direction that is not detected from ruling lines does not need any
+    settings = table_settings or {}
+    horizontal = settings.get("horizontal_strategy", "lines") in LINE_STRATEGIES
+    vertical = settings.get("vertical_strategy", "lines") in LINE_STRATEGIES
+
+    return MIN_HORIZONTAL_LINES if horizontal else 0, MIN_VERTICAL_LINES if vertical else 0
+
+
+def triage_page(page, previous_kept=False, table_settings: dict | None = None) -> PageTriage:
+    words = page.get_text("words")
+    question_numbers = sum(1 for word in words if QUESTION_NUMBER_PATTERN.match(word[4]))
+    horizontal, vertical = count_ruling_lines(page)
+
+    def result(keep: bool, reason: str):
+        return PageTriage(page_number=page.number + 1,
+                          keep=keep,
+                          reason=reason,
+                          horizontal_lines=horizontal,
+                          vertical_lines=vertical,
+                          words=len(words),
+                          question_numbers=question_numbers)
+
+    # a sparse page can still hold the last choice of a question, so only pages
+    # without any text are treated as blank
+    if len(words) == 0:
+        return result(False, "blank page")
+
+    min_horizontal, min_vertical = get_required_lines(table_settings)
+
+    if horizontal < min_horizontal or vertical < min_vertical:
+        return result(False, "no table grid")
+
+    # a page without question numbers can still hold rows that continue the last
+    # question of the previous page, so it is only skipped when nothing precedes it
+    if question_numbers == 0 and not previous_kept:
+        return result(False, "no question numbers")
+
+    return result(True, "table with questions" if question_numbers > 0 else "continuation table")
+
+
+def triage_document(document, page_indices: Iterable[int], table_settings: dict | None = None) -> list[PageTriage]:
+    results = []
+    previous_kept = False
+    previous_idx = None
+
+    for page_idx in page_indices:
+        # only a directly preceding page can be continued
+        if previous_idx is not None and page_idx != previous_idx + 1:
+            previous_kept = False
+
+        with MUPDF_LOCK:
+            triage = triage_page(document[page_idx], previous_kept, table_settings)
+
+        results.append(triage)
+        previous_kept = triage.keep
+        previous_idx = page_idx
+
+    return results
+
+
+def triage_source(source,
+                  start_page: int | None = None,
+                  end_page: int | None = None,
+                  table_settings: dict | None = None) -> list[PageTriage]:
+    # leave file-like sources where they were, so pdfplumber can read them afterwards
+    position = source.tell() if hasattr(source, "tell") else None
+    document = open_document(source)
+
+    if position is not None:
+        source.seek(position)
+
+    try:
+        return triage_document(document, normalize_page_range(document.page_count, start_page, end_page), table_settings)
+    finally:
+        with MUPDF_LOCK:
+            document.close()
+
+
+def describe_triage(triage: PageTriage) -> str:
+    return (f"Page #{triage.page_number}: {triage.reason} "
+            f"({triage.words} words, {triage.horizontal_lines}/{triage.vertical_lines} horizontal/vertical lines, "
+            f"{triage.question_numbers} question numbers)")
+
+
+def print_triage(results: list[PageTriage]):
+    for triage in results:
+        if not triage.keep:
+            print(f"Skipping {describe_triage(triage)}")
+
+    skipped = sum(1 for triage in results if not triage.keep)
+    print(f"Triage: skipped {skipped} of {len(results)} pages")
@@ -0,0 +1,168 @@
+import json
+import statistics
+import time
+from dataclasses import dataclass, field, replace
+from itertools import product
+from typing import Callable, Iterable
+from vcegen.utils.pages import count_pages, get_pages, normalize_page_range, preload_page
+from vcegen.utils.results import count_valid_rows
+
+# pdfplumber's own defaults come first, so ties are resolved in their favor
+DEFAULT_TABLE_SETTINGS = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "lines",
+    "snap_tolerance": 3,
+    "join_tolerance": 3,
+    "intersection_tolerance": 3,
+}
+
+# a single run over a few pages takes tens of milliseconds and is mostly noise,
+# so candidates that tie on quality are timed this many times, and an equally
+# good candidate only replaces an earlier one when its median is at least
+# FASTER_MARGIN faster
+TIMING_REPEATS = 5
+FASTER_MARGIN = 0.2
+
+
+def get_candidate_settings() -> list[dict]:
+    candidates = []
+
+    # ruling lines drawn by some PDF producers do not quite meet, so looser
+    # tolerances let pdfplumber join them into a grid again
+    for snap, join, intersection in product([3, 5], [3, 6], [3, 6]):
+        candidates.append({**DEFAULT_TABLE_SETTINGS,
+                           "snap_tolerance": snap,
+                           "join_tolerance": join,
+                           "intersection_tolerance": intersection})
+
+    # tables with missing borders can only be found from the text alignment
+    for vertical, horizontal in [("text", "text"), ("lines", "text"), ("text", "lines")]:
+        candidates.append({**DEFAULT_TABLE_SETTINGS,
+                           "vertical_strategy": vertical,
+                           "horizontal_strategy": horizontal})
+
+    return candidates
+
+
+@dataclass(frozen=True)
+class TuningCandidate:
+    settings: dict = field(hash=False)
+    questions: int
+    valid: int
+    elapsed: float
+    error: str | None = None
+
+
+    @property
+    def valid_ratio(self):
+        return self.valid / self.questions if self.questions > 0 else 0
+
+
+    def sort_key(self):
+        # more valid questions first, then the cleaner extraction; a candidate that
+        # finds a single valid row must not beat one that finds all of them, so the
+        # ratio alone is not enough
+        return (self.error is not None, -self.valid, -self.valid_ratio)
+
+
+def time_evaluation(evaluate: Callable[[dict], list[dict]], settings: dict) -> tuple[list[dict], float]:
+    started_at = time.perf_counter()
+    rows = evaluate(settings)
+
+    return rows, time.perf_counter() - started_at
+
+
+def tune_table_settings(evaluate: Callable[[dict], list[dict]],
+                        candidates: list[dict] | None = None,
+                        min_choices: int = 3,
+                        debug: bool = False) -> list[TuningCandidate]:
+    results = []
+
+    for settings in candidates or get_candidate_settings():
+        started_at = time.perf_counter()
+
+        try:
+            rows, elapsed = time_evaluation(evaluate, settings)
+        except Exception as e:
+            results.append(TuningCandidate(settings, 0, 0, time.perf_counter() - started_at, f"{type(e).__name__}: {e}"))
+            continue
+
+        results.append(TuningCandidate(settings, len(rows), count_valid_rows(rows, min_choices), elapsed))
+
+    # the sort is stable, so equally good candidates keep their listed order
+    results.sort(key=TuningCandidate.sort_key)
+    tied = [candidate for candidate in results if candidate.error is None and candidate.sort_key() == results[0].sort_key()]
+
+    if len(tied) > 1:
+        timed = [replace(candidate, elapsed=statistics.median([candidate.elapsed] + [
+            time_evaluation(evaluate, candidate.settings)[1] for _ in range(TIMING_REPEATS - 1)
+        ])) for candidate in tied]
+        results[:len(tied)] = timed
+        fastest = min(timed, key=lambda candidate: candidate.elapsed)
+
+        if fastest.elapsed < timed[0].elapsed * (1 - FASTER_MARGIN):
+            results.remove(fastest)
+            results.insert(0, fastest)
+
+    if debug:
+        print_tuning(results)
+
+    return results
+
+
+def get_sample_pages(pdf,
+                     sample_pages: int,
+                     start_page: int | None = None,
+                     end_page: int | None = None,
+                     skipped_page_numbers: Iterable[int] = ()) -> list:
+    # the first pages that a parse of the same range would actually read, so
+    # cover pages and pages skipped by triage do not decide the settings
+    skipped = set(skipped_page_numbers)
+    page_indices = [page_idx for page_idx in normalize_page_range(count_pages(pdf), start_page, end_page)
+                    if page_idx + 1 not in skipped]
+
+    return get_pages(pdf, page_indices[:sample_pages])
+
+
+def tune_pages(pages: list,
+               scan_tables: Callable[[list, list[dict]], object],
+               candidates: list[dict] | None = None,
+               min_choices: int = 3,
+               debug: bool = False) -> list[TuningCandidate]:
+    # the pages are shared by every candidate: pdfplumber caches the characters
+    # and ruling lines of a page, so only table detection is repeated. They are
+    # loaded up front, so the first candidate is not timed with them
+    for page in pages:
+        preload_page(page)
+
+    def evaluate(settings: dict):
+        rows = []
+
+        for page in pages:
+            scan_tables(page.extract_tables(settings), rows)
+
+        return rows
+
+    return tune_table_settings(evaluate, candidates, min_choices, debug)
+
+
+def print_tuning(results: list[TuningCandidate]):
+    for candidate in results:
+        settings = ", ".join(f"{key}={value}" for key, value in candidate.settings.items() if DEFAULT_TABLE_SETTINGS.get(key) != value)
+
+        if candidate.error is not None:
+            print(f"[{settings or 'defaults'}] failed: {candidate.error}")
+            continue
+
+        print(f"[{settings or 'defaults'}] {candidate.valid}/{candidate.questions} valid "
+              f"({candidate.valid_ratio:.0%}) in {candidate.elapsed:.2f}s")
+
+
+def save_table_settings(path: str, settings: dict, strategy: str | None = None):
+    with open(path, "w") as file:
+        json.dump({"strategy": strategy, "table_settings": settings}, file, indent=2)
+
+
+def load_table_settings(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)["table_settings"]
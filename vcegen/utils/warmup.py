@@ -0,0 +1,100 @@
+import importlib
+import time
+from io import BytesIO
+from vcegen.utils.mupdf import MUPDF_LOCK, open_document
+
+# heavy modules that the strategies import or load lazily on their first run
+PRELOAD_MODULES = [
+    "pandas",
+    "pymupdf",
+    "pdfplumber",
+    "pdfminer.high_level",
+    "pdfminer.layout",
+]
+
+# minimal tables laid out the way each strategy expects them
+SAMPLE_TABLES = {
+    "standard": [
+        ["QUESTION", "CHOICES", "ANSWER", "RATIONALE"],
+        ["1. What is warm?", "A. hot", "A", "Warm is close to hot"],
+        [None, "B. cold", None, "Cold is not warm"],
+        [None, "C. ice", None, "Ice is cold"],
+    ],
+    "triplecolumn": [
+        ["QUESTION", "ANSWER", "RATIONALE"],
+        ["1. What is warm? a. hot b. cold c. ice", "a. hot", "Warm is close to hot"],
+    ],
+    "pymupdf": [
+        ["QUESTION", "", "CHOICES", "ANSWER & RATIONALE", ""],
+        ["1", "What is warm?", "A. hot", "A", "Warm is close to hot"],
+        [None, None, "B. cold", None, "Cold is not warm"],
+        [None, None, "C. ice", None, "Ice is cold"],
+    ],
+}
+
+
+def build_sample_pdf(cells: list[list[str | None]], column_width=110, row_height=36) -> bytes:
+    import pymupdf
+
+    # the warm-up runs on the parser pool while requests may already be parsing
+    document = open_document()
+    x0, y0 = 30, 40
+
+    try:
+        with MUPDF_LOCK:
+            page = document.new_page()
+
+            for row_idx, row in enumerate(cells):
+                for col_idx, text in enumerate(row):
+                    rect = pymupdf.Rect(x0 + col_idx * column_width,
+                                        y0 + row_idx * row_height,
+                                        x0 + (col_idx + 1) * column_width,
+                                        y0 + (row_idx + 1) * row_height)
+                    page.draw_rect(rect, color=(0, 0, 0), width=0.5)
+
+                    if text:
+                        page.insert_textbox(rect + (3, 3, -3, -3), text, fontsize=8)
+
+            return document.tobytes()
+    finally:
+        with MUPDF_LOCK:
+            document.close()
+
+
+def preload_modules():
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+
+def warm_up(debug=False) -> dict[str, float]:
+    from vcegen.strategies import create_strategy
+    from vcegen.utils.text import split_words
+
+    timings = {}
+
+    started_at = time.perf_counter()
+    preload_modules()
+    timings["imports"] = time.perf_counter() - started_at
+
+    # loads wordninja's language model, or maps the shared word-cost table
+    # when the `shared` correction backend is selected
+    started_at = time.perf_counter()
+    split_words("warmingup")
+    timings["corrections"] = time.perf_counter() - started_at
+
+    for name, cells in SAMPLE_TABLES.items():
+        started_at = time.perf_counter()
+        strategy = create_strategy(name, BytesIO(build_sample_pdf(cells)), apply_corrections=True)
+
+        try:
+            strategy.run()
+        finally:
+            strategy.close()
+
+        timings[name] = time.perf_counter() - started_at
+
+    if debug:
+        for stage, elapsed in timings.items():
+            print(f"Warm-up: {stage} took {elapsed:.3f}s")
+
+    return timings
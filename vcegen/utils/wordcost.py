@@ -0,0 +1,238 @@
+import gzip
+import importlib.util
+import mmap
+import os
+import re
+import struct
+import zlib
+from math import log
+from vcegen.utils.cache import get_cache_dir
+
+# File layout (all integers are little-endian uint32):
+#
+#   header   MAGIC, word_count, unique_count, max_word, slot_count
+#   slots    slot_count entries of (rank + 1), 0 marks an empty slot
+#   offsets  unique_count + 1 offsets into the word blob, indexed by rank order
+#   ranks    unique_count original ranks, in the same order as offsets
+#   blob     the ASCII words, back to back
+#
+# Slots form an open-addressing hash table keyed by crc32, which (unlike `hash()`)
+# is stable across processes, so every worker can probe the same read-only mapping.
+MAGIC = b"VCEWCOST"
+HEADER = struct.Struct("<8sIIII")
+MISSING_COST = 9e999
+
+# same tokenization as wordninja
+SPLIT_PATTERN = re.compile("[^a-zA-Z0-9']+")
+
+
+def get_wordninja_words_path():
+    # locate the word list without importing wordninja, which would load its model
+    spec = importlib.util.find_spec("wordninja")
+
+    if spec is None or spec.origin is None:
+        raise ModuleNotFoundError("wordninja is required to build the word-cost table")
+
+    return os.path.join(os.path.dirname(spec.origin), "wordninja", "wordninja_words.txt.gz")
+
+
+def get_default_table_path():
+    cache_dir = get_cache_dir()
+    source = get_wordninja_words_path()
+    stat = os.stat(source)
+
+    # tie the table to the word list it was built from
+    return os.path.join(cache_dir, f"wordcost-{stat.st_size:x}-{int(stat.st_mtime):x}.bin")
+
+
+def build_table(path: str, words_path: str | None = None):
+    with gzip.open(words_path or get_wordninja_words_path()) as file:
+        words = file.read().decode().split()
+
+    # wordninja keeps the last rank of duplicated words
+    ranks = {word: rank for rank, word in enumerate(words)}
+    unique_words = list(ranks)
+    slot_count = 1 << (len(unique_words) * 2 - 1).bit_length()
+    slots = [0] * slot_count
+    mask = slot_count - 1
+    encoded = [word.encode("ascii") for word in unique_words]
+
+    for idx, word in enumerate(encoded):
+        slot = zlib.crc32(word) & mask
+
+        while slots[slot] != 0:
+            slot = (slot + 1) & mask
+
+        slots[slot] = idx + 1
+
+    offsets = [0]
+
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(words), len(unique_words), max(len(w) for w in words), slot_count))
+        file.write(struct.pack(f"<{slot_count}I", *slots))
+        file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        file.write(struct.pack(f"<{len(unique_words)}I", *[ranks[word] for word in unique_words]))
+        file.write(b"".join(encoded))
+
+    # several workers may build the table at the same time; the last rename wins
+    # and every reader sees a complete file
+    os.replace(tmp_path, path)
+
+    return path
+
+
+class SharedLanguageModel:
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with open(path, "rb") as file:
+            self.__mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, word_count, unique_count, max_word, slot_count = HEADER.unpack_from(self.__mmap, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a word-cost table")
+
+        view = memoryview(self.__mmap)
+        slots_start = HEADER.size
+        offsets_start = slots_start + slot_count * 4
+        ranks_start = offsets_start + (unique_count + 1) * 4
+        blob_start = ranks_start + unique_count * 4
+
+        self.__slots = view[slots_start:offsets_start].cast("I")
+        self.__offsets = view[offsets_start:ranks_start].cast("I")
+        self.__ranks = view[ranks_start:blob_start].cast("I")
+        self.__blob_start = blob_start
+        self.__mask = slot_count - 1
+        self.__log_count = log(word_count)
+        self._maxword = max_word
+
+
+    @classmethod
+    def load(cls, path: str | None = None):
+        path = path or get_default_table_path()
+
+        if not os.path.exists(path):
+            build_table(path)
+
+        return cls(path)
+
+
+    def cost(self, word: str):
+        return self.__cost(word.lower().encode("ascii", "ignore"))
+
+
+    def __cost(self, key: bytes):
+        slot = zlib.crc32(key) & self.__mask
+        slots = self.__slots
+        offsets = self.__offsets
+
+        while True:
+            entry = slots[slot]
+
+            if entry == 0:
+                return MISSING_COST
+
+            idx = entry - 1
+            start = offsets[idx]
+
+            if offsets[idx + 1] - start == len(key) and self.__mmap[self.__blob_start + start:self.__blob_start + start + len(key)] == key:
+                # same expression as wordninja, so costs are bit-for-bit identical
+                return log((self.__ranks[idx] + 1) * self.__log_count)
+
+            slot = (slot + 1) & self.__mask
+
+
+    def split(self, s: str):
+        return [item for part in SPLIT_PATTERN.split(s) for item in self._split(part)]
+
+
+    def _split(self, s: str):
+        # the same dynamic program as wordninja, reading costs from the shared table
+        # instead of a per-process dictionary; ties are broken the same way (shortest
+        # word first), and the best match of each position is remembered instead of
+        # being recomputed while walking back
+        #
+        # SPLIT_PATTERN leaves ASCII only, so byte offsets match character offsets
+        data = s.lower().encode("ascii")
+        mmap_ = self.__mmap
+        slots = self.__slots
+        offsets = self.__offsets
+        ranks = self.__ranks
+        blob_start = self.__blob_start
+        mask = self.__mask
+        log_count = self.__log_count
+        maxword = self._maxword
+        crc32 = zlib.crc32
+
+        cost = [0]
+        best_lengths = [0]
+
+        for i in range(1, len(data) + 1):
+            best_cost = None
+            best_length = 0
+
+            for k in range(min(i, maxword)):
+                key = data[i - k - 1:i]
+                slot = crc32(key) & mask
+                word_cost = MISSING_COST
+
+                while True:
+                    entry = slots[slot]
+
+                    if entry == 0:
+                        break
+
+                    start = offsets[entry - 1]
+
+                    if offsets[entry] - start == k + 1 and mmap_[blob_start + start:blob_start + start + k + 1] == key:
+                        # same expression as wordninja, so costs are bit-for-bit identical
+                        word_cost = log((ranks[entry - 1] + 1) * log_count)
+                        break
+
+                    slot = (slot + 1) & mask
+
+                candidate = cost[i - k - 1] + word_cost
+
+                if best_cost is None or candidate < best_cost:
+                    best_cost = candidate
+                    best_length = k + 1
+
+            cost.append(best_cost)
+            best_lengths.append(best_length)
+
+        out = []
+        i = len(s)
+
+        while i > 0:
+            k = best_lengths[i]
+            new_token = True
+
+            # ignore a lone apostrophe
+            if not s[i - k:i] == "'":
+                if len(out) > 0:
+                    # combine a digit followed by a digit, and attach "'s" to the previous token
+                    if out[-1] == "'s" or (s[i - 1].isdigit() and out[-1][0].isdigit()):
+                        out[-1] = s[i - k:i] + out[-1]
+                        new_token = False
+
+            if new_token:
+                out.append(s[i - k:i])
+
+            i -= k
+
+        return reversed(out)
+
+
+if __name__ == "__main__":
+    import sys
+
+    table_path = build_table(sys.argv[1] if len(sys.argv) > 1 else get_default_table_path())
+    print(f"Built word-cost table at {table_path}")
@@ -0,0 +1,372 @@
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import time
+import traceback
+from datetime import datetime, timezone
+from watchfiles import watch
+from vcegen.strategies import STRATEGIES, create_strategy
+from vcegen.utils.results import count_valid_rows
+from vcegen.utils.text import get_correction_backend, get_shared_model
+
+CLAIMED_DIR = ".claimed"
+
+# number of stale claims recorded per file, kept next to the worker directories
+ATTEMPTS_DIR = ".attempts"
+
+# auto-detection compares the strategies on the first few pages only, like `/preview`
+DETECT_PAGES = 2
+
+
+class SpoolWatcher:
+
+    def __init__(self,
+                 inbox: str,
+                 outbox: str,
+                 strategy: str | None = None,
+                 quarantine: str | None = None,
+                 boxed_choices = False,
+                 exclude_rationale = False,
+                 apply_corrections = False,
+                 settle_time = 1.0,
+                 poll_interval = 5.0,
+                 claim_timeout = 3600.0,
+                 max_attempts = 3,
+                 detect_pages = DETECT_PAGES,
+                 debug = False
+        ):
+        if strategy is not None and strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy `{strategy}`")
+
+        self.inbox = os.path.abspath(inbox)
+        self.outbox = os.path.abspath(outbox)
+        self.quarantine = os.path.abspath(quarantine) if quarantine else os.path.join(self.outbox, "quarantine")
+        self.processed = os.path.join(self.outbox, "processed")
+        self.claimed_root = os.path.join(self.inbox, CLAIMED_DIR)
+        self.attempts = os.path.join(self.claimed_root, ATTEMPTS_DIR)
+        self.strategy = strategy
+        self.boxed_choices = boxed_choices
+        self.exclude_rationale = exclude_rationale
+        self.apply_corrections = apply_corrections
+        self.settle_time = settle_time
+        self.poll_interval = poll_interval
+        self.claim_timeout = claim_timeout
+        self.max_attempts = max_attempts
+        self.detect_pages = detect_pages
+        self.debug = debug
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+
+        # every worker claims files into its own directory, so a claimed file keeps
+        # its original name and can be put back if the worker dies
+        self.claimed = os.path.join(self.claimed_root, self.worker_id)
+
+        for directory in [self.outbox, self.quarantine, self.processed, self.claimed, self.attempts]:
+            os.makedirs(directory, exist_ok=True)
+
+
+    def __log(self, message: str):
+        print(f"[{self.worker_id}] {message}", flush=True)
+
+
+    def __is_candidate(self, name: str):
+        if name.startswith(".") or not name.lower().endswith(".pdf"):
+            return False
+
+        path = os.path.join(self.inbox, name)
+
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+
+        # skip files that may still be in the middle of being copied into the inbox
+        return time.time() - stat.st_mtime >= self.settle_time
+
+
+    def claim(self, name: str) -> str | None:
+        # rename is atomic within a filesystem, so exactly one worker (on any
+        # host sharing the spool) wins the race for each file
+        claimed_path = os.path.join(self.claimed, name)
+
+        # another worker removes this directory if it stays empty for longer than
+        # `claim_timeout`, e.g. while the inbox is idle
+        os.makedirs(self.claimed, exist_ok=True)
+
+        try:
+            os.rename(os.path.join(self.inbox, name), claimed_path)
+        except (FileNotFoundError, FileExistsError):
+            return None
+
+        # a rename keeps the original modification time, so record when the file
+        # was claimed for `recover_claims()`
+        os.utime(claimed_path)
+
+        return claimed_path
+
+
+    def __read_attempts(self, name: str):
+        try:
+            with open(os.path.join(self.attempts, name)) as file:
+                return int(file.read())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+
+    def __write_attempts(self, name: str, attempts: int):
+        path = os.path.join(self.attempts, name)
+        tmp_path = f"{path}.{self.worker_id}.tmp"
+
+        with open(tmp_path, "w") as file:
+            file.write(str(attempts))
+
+        os.replace(tmp_path, path)
+
+
+    def __clear_attempts(self, name: str):
+        try:
+            os.remove(os.path.join(self.attempts, name))
+        except FileNotFoundError:
+            pass
+
+
+    def recover_claims(self):
+        # files claimed by a worker that died mid-parse would otherwise stay in
+        # `.claimed` forever; claims older than `claim_timeout` are put back into
+        # the inbox, since a live worker would have finished with them by now
+        recovered = 0
+
+        for worker_id in os.listdir(self.claimed_root):
+            directory = os.path.join(self.claimed_root, worker_id)
+
+            if worker_id.startswith(".") or not os.path.isdir(directory):
+                continue
+
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+
+                try:
+                    if time.time() - os.stat(path).st_mtime < self.claim_timeout:
+                        continue
+                except FileNotFoundError:
+                    continue
+
+                # a file that keeps killing its worker (e.g. by crashing MuPDF) is
+                # quarantined instead of being handed to the next worker forever
+                attempts = self.__read_attempts(name) + 1
+
+                # never overwrite a newer copy that was dropped into the inbox meanwhile
+                requeue = attempts < self.max_attempts and not os.path.exists(os.path.join(self.inbox, name))
+                destination = os.path.join(self.inbox if requeue else self.quarantine, name)
+
+                # recorded before the file is visible in the inbox again, so a worker that
+                # picks it up and finishes it straight away also clears the count
+                if requeue:
+                    self.__write_attempts(name, attempts)
+
+                try:
+                    os.rename(path, destination)
+                except FileNotFoundError:
+                    # another worker recovered it first
+                    continue
+
+                recovered += 1
+
+                if requeue:
+                    self.__log(f"{name}: recovered a stale claim of {worker_id} (attempt {attempts})")
+                    continue
+
+                self.__clear_attempts(name)
+                self.__write_json(os.path.join(self.outbox, f"{os.path.splitext(name)[0]}.json"), {
+                    "source": name,
+                    "worker": worker_id,
+                    "status": "failed",
+                    "error": f"The worker stopped while parsing the file ({attempts} attempts)",
+                    "attempts": attempts,
+                })
+                self.__log(f"{name}: quarantined a stale claim of {worker_id} (attempt {attempts})")
+
+            # directories of workers that are gone are removed once they have been
+            # empty for longer than `claim_timeout`; live workers recreate theirs
+            # in `claim()` anyway
+            if directory == self.claimed:
+                continue
+
+            try:
+                if time.time() - os.stat(directory).st_mtime >= self.claim_timeout:
+                    os.rmdir(directory)
+            except OSError:
+                pass
+
+        return recovered
+
+
+    def __write_json(self, path: str, payload: dict):
+        # write to a temporary file first so readers never see a partial status file
+        tmp_path = f"{path}.{self.worker_id}.tmp"
+
+        with open(tmp_path, "w") as file:
+            json.dump(payload, file, indent=2)
+
+        os.replace(tmp_path, path)
+
+
+    def __parse(self, path: str, strategy_name: str, start_page: int | None = None, end_page: int | None = None):
+        strategy = create_strategy(strategy_name,
+                                   path,
+                                   boxed_choices=self.boxed_choices,
+                                   exclude_rationale=self.exclude_rationale,
+                                   apply_corrections=self.apply_corrections,
+                                   debug=self.debug)
+
+        try:
+            strategy.run(start_page, end_page)
+        finally:
+            strategy.close()
+
+        return strategy
+
+
+    def __detect(self, path: str):
+        # try every strategy on the first few pages and keep the one that yields
+        # the most valid rows; ties go to the strategy listed first in STRATEGIES
+        best = None
+        best_score = -1
+        scores = {}
+
+        for name in STRATEGIES:
+            try:
+                strategy = self.__parse(path, name, 1, self.detect_pages)
+            except Exception:
+                scores[name] = None
+                continue
+
+            scores[name] = count_valid_rows(strategy.result)
+
+            if scores[name] > best_score:
+                best, best_score = name, scores[name]
+
+        if best is None:
+            raise RuntimeError("None of the strategies could parse the document")
+
+        return best, scores
+
+
+    def process(self, claimed_path: str, name: str):
+        stem = os.path.splitext(name)[0]
+        started_at = time.time()
+        status = {
+            "source": name,
+            "worker": self.worker_id,
+            "started_at": datetime.fromtimestamp(started_at, timezone.utc).isoformat(),
+        }
+
+        try:
+            if self.strategy is not None:
+                strategy_name = self.strategy
+                strategy = self.__parse(claimed_path, strategy_name)
+            else:
+                strategy_name, status["strategy_scores"] = self.__detect(claimed_path)
+                strategy = self.__parse(claimed_path, strategy_name)
+
+            if hasattr(strategy, "validate"):
+                # only the counts are kept in the status file, instead of logging every invalid row
+                strategy.validate(print_results=False)
+
+            export_path = os.path.join(self.outbox, f"{stem}.txt")
+            strategy.export(export_path)
+
+            status.update({
+                "status": "done",
+                "strategy": strategy_name,
+                "questions": len(strategy.result) if strategy.result is not None else 0,
+                "invalid": len(getattr(strategy, "invalid", None) or []),
+                "export": export_path if os.path.exists(export_path) else None,
+            })
+            destination = os.path.join(self.processed, name)
+        except Exception as e:
+            status.update({
+                "status": "failed",
+                "error": f"{type(e).__name__}: {e}",
+                "traceback": traceback.format_exc(),
+            })
+            destination = os.path.join(self.quarantine, name)
+
+        status["elapsed"] = round(time.time() - started_at, 3)
+        shutil.move(claimed_path, destination)
+        self.__clear_attempts(name)
+        self.__write_json(os.path.join(self.outbox, f"{stem}.json"), status)
+        self.__log(f"{name}: {status['status']} in {status['elapsed']}s")
+
+        return status
+
+
+    def scan_once(self):
+        processed = 0
+
+        for name in sorted(os.listdir(self.inbox)):
+            if not self.__is_candidate(name):
+                continue
+
+            claimed_path = self.claim(name)
+
+            if claimed_path is None:
+                continue
+
+            self.process(claimed_path, name)
+            processed += 1
+
+        return processed
+
+
+    def run(self, stop_event=None):
+        self.__log(f"Watching {self.inbox}")
+        self.recover_claims()
+        self.scan_once()
+
+        # filesystem events wake the worker up early; the timeout makes it rescan
+        # regularly anyway, which picks up files that were still settling and files
+        # dropped on network filesystems that do not deliver events
+        for _ in watch(self.inbox,
+                       watch_filter=lambda _, path: path.lower().endswith(".pdf"),
+                       rust_timeout=int(self.poll_interval * 1000),
+                       yield_on_timeout=True,
+                       recursive=False,
+                       stop_event=stop_event):
+            # workers that die are not restarted, so the live ones keep putting
+            # their stale claims back on every pass
+            self.recover_claims()
+            self.scan_once()
+
+
+def run_worker(inbox: str, outbox: str, **options):
+    try:
+        SpoolWatcher(inbox, outbox, **options).run()
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(inbox: str, outbox: str, workers=1, **options):
+    if options.get("apply_corrections") and get_correction_backend() == "shared":
+        # build (or map) the word-cost table once, before the workers start
+        get_shared_model()
+
+    if workers <= 1:
+        run_worker(inbox, outbox, **options)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(inbox, outbox), kwargs=options)
+        for _ in range(workers)
+    ]
+
+    for process in processes:
+        process.start()
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()